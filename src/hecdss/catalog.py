@@ -1,17 +1,207 @@
+import os
+import zipfile
+from array import array
+from fnmatch import fnmatchcase
+from itertools import islice
+from typing import NamedTuple
+
+import numpy as np
+
 from .record_type import RecordType
 from .dsspath import DssPath
 from datetime import datetime
 import re
 
+_TIME_SERIES_TYPES = [RecordType.RegularTimeSeries, RecordType.IrregularTimeSeries,
+                      RecordType.RegularTimeSeriesProfile]
+_OTHER_TYPES = [RecordType.PairedData, RecordType.Grid, RecordType.Text,
+                RecordType.LocationInfo, RecordType.Array]
+_SERIES = -1  # D part code of a condensed time-series key
+_CACHE_VERSION = 1  # format of files written by Catalog.save
+
+
+def _block_date(d_part):
+    """returns the datetime of a time-series block D part ('DDMMMYYYY'), or None"""
+    if re.match(r"^\d{2}[A-Za-z]{3}\d{4}$", d_part):  # Check if D part matches the format 'DDMMMYYYY'
+        return datetime.strptime(d_part, "%d%b%Y")
+    return None
+
+
+def _split_path(pathname):
+    """returns the six parts of a DSS pathname"""
+    if len(pathname.strip()) < 7 or pathname[0] != '/' or pathname[-1] != '/':
+        raise Exception("Invalid DSS Path: '" + pathname + "'")
+    parts = pathname[1:-1].split('/')
+    if len(parts) < 6:
+        raise Exception("Invalid DSS Path: '" + pathname + "'")
+    return parts[:6]
+
+
+class CatalogRecord(NamedTuple):
+    """one uncondensed catalog record; str() gives the pathname"""
+    path: str
+    recType: RecordType
+
+    def __str__(self):
+        return self.path
+
+
 class Catalog:
-    """manage list of objects inside a DSS database"""
+    """manage list of objects inside a DSS database
+
+    Pathnames are stored as columns: each distinct string of each part (A to F) is kept
+    once and records hold integer codes. Parts compare without case, as in DSS.
+    Time-series records are condensed by grouping on the codes of every part except D.
+    DssPath objects are only created for items.
+    """
     def __init__(self, uncondensed_paths, recordTypes):
-        self.uncondensed_paths = uncondensed_paths
+        # any other iterable is consumed once, and uncondensed_paths is rebuilt from part codes on request
+        self._uncondensed_paths = uncondensed_paths if isinstance(uncondensed_paths, list) else None
+        self._paths = uncondensed_paths
         self.rawRecordTypes = recordTypes
-        self.timeSeriesDictNoDates = {}  # key is path without date, value is a list of dates
-        self.recordTypeDict = {} # key is path w/o date, value is recordType
+        self._raw = np.empty((0, 6), dtype=np.int32)  # part codes of each scanned record
+        self._strings = [[] for _ in range(6)]  # code -> part string, per part
+        self._codes_of = [{} for _ in range(6)]  # part string -> code
+        self._fold = [[] for _ in range(6)]  # code -> code of the first string equal without case
+        self._lower_of = [{} for _ in range(6)]  # lowercase part string -> folded code
+        self._types = {}  # key -> RecordType; key is a tuple of folded part codes, D is _SERIES for time-series
+        self._dates = {}  # time-series key -> sorted datetime64[D] array of block dates
+        self._names = {}  # key -> part codes as written (original case) of a record with that key
+        self._order = {}  # key -> sequence number, in the order keys were added
+        self._index = None  # per part: folded code -> set of keys, built by the first find
+        self._items = None
         self.__create_condensed_catalog()
 
+    def _intern(self, part, s):
+        code = self._codes_of[part].get(s)
+        if code is None:
+            code = len(self._strings[part])
+            self._strings[part].append(s)
+            self._codes_of[part][s] = code
+            self._fold[part].append(self._lower_of[part].setdefault(s.lower(), code))
+        return code
+
+    def _key(self, pathname, record_type=None, intern=False):
+        """returns the key of pathname, or None if a part was never seen (and intern is False)"""
+        parts = _split_path(str(pathname))
+        if intern:
+            key = [self._fold[i][self._intern(i, s)] for i, s in enumerate(parts)]
+        else:
+            key = [self._lower_of[i].get(s.lower()) for i, s in enumerate(parts)]
+        if record_type in _TIME_SERIES_TYPES:
+            key[3] = _SERIES
+        return tuple(key)
+
+    def _series_key(self, key):
+        return key[:3] + (_SERIES,) + key[4:]
+
+    def _path(self, key):
+        """returns the pathname of key, with an empty D part for a time-series"""
+        parts = [self._strings[i][c] for i, c in enumerate(self._names[key])]
+        if key[3] == _SERIES:
+            parts[3] = ""
+        return "/" + "/".join(parts) + "/"
+
+    @staticmethod
+    def from_records(records):
+        """
+        builds a catalog from an iterable of (pathname, raw record type), such as
+        the native catalog iterator, without holding a list of the pathnames
+
+        Args:
+            records (iterable): (str, int) pairs
+
+        Returns:
+            Catalog: the catalog
+        """
+        recordTypes = array("i")
+
+        def paths():
+            for path, recordType in records:
+                recordTypes.append(recordType)
+                yield path
+
+        # the paths are interned before the record types are read, so recordTypes is complete by then
+        return Catalog(paths(), recordTypes)
+
+    @property
+    def uncondensed_paths(self):
+        """pathnames of the scanned records, in catalog order"""
+        if self._uncondensed_paths is None:
+            columns = [np.array(self._strings[i], dtype=object)[self._raw[:, i]] for i in range(6)]
+            self._uncondensed_paths = ["/" + "/".join(parts) + "/" for parts in zip(*columns)]
+        return self._uncondensed_paths
+
+    def save(self, filename, stamp):
+        """
+        writes this catalog, as scanned, to a binary cache file
+
+        Args:
+            filename (str): cache file, replaced atomically
+            stamp (tuple): integers identifying the state of the DSS file, checked by :meth:`load`
+        """
+        keys = list(self._order)
+        position = {k: i for i, k in enumerate(keys)}
+        dateKeys = list(self._dates)
+        arrays = {
+            "meta": np.array([_CACHE_VERSION, len(stamp)] + list(stamp), dtype=np.int64),
+            "counts": np.array([len(strings) for strings in self._strings], dtype=np.int64),
+            "raw": self._raw,
+            "raw_types": np.asarray(self.rawRecordTypes, dtype=np.int32),
+            "keys": np.array(keys, dtype=np.int32).reshape(-1, 6),
+            "names": np.array([self._names[k] for k in keys], dtype=np.int32).reshape(-1, 6),
+            "types": np.array([self._types[k].value for k in keys], dtype=np.int32),
+            "date_keys": np.array([position[k] for k in dateKeys], dtype=np.int64),
+            "date_counts": np.array([len(self._dates[k]) for k in dateKeys], dtype=np.int64),
+            "dates": np.concatenate([self._dates[k] for k in dateKeys] or [np.empty(0, dtype="datetime64[D]")]),
+        }
+        for i in range(6):
+            # part strings never contain '/'
+            arrays[f"part{i}"] = np.frombuffer("/".join(self._strings[i]).encode("utf-8"), dtype=np.uint8)
+        tmp = f"{filename}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, filename)
+
+    @staticmethod
+    def load(filename, stamp):
+        """
+        reads a catalog written by :meth:`save`
+
+        Args:
+            filename (str): cache file
+            stamp (tuple): integers identifying the current state of the DSS file
+
+        Returns:
+            Catalog: the catalog, or None if the file is missing, unreadable, or has another stamp.
+        """
+        try:
+            with np.load(filename, allow_pickle=False) as f:
+                meta = f["meta"]
+                if len(meta) < 2 or meta[0] != _CACHE_VERSION or tuple(meta[2:].tolist()) != tuple(stamp):
+                    return None
+                arrays = {name: f[name] for name in f.files}
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+
+        c = Catalog([], [])
+        c._uncondensed_paths = None
+        c._raw = arrays["raw"]
+        c.rawRecordTypes = arrays["raw_types"]
+        for i in range(6):
+            strings = arrays[f"part{i}"].tobytes().decode("utf-8").split("/") if arrays["counts"][i] else []
+            for part in strings:
+                c._intern(i, part)
+        keys = list(map(tuple, arrays["keys"].tolist()))
+        for key, names, rt in zip(keys, arrays["names"].tolist(), arrays["types"].tolist()):
+            c._types[key] = RecordType(rt)
+            c._names[key] = tuple(names)
+            c._order[key] = len(c._order)
+        bounds = np.r_[0, np.cumsum(arrays["date_counts"])]
+        for k, s, e in zip(arrays["date_keys"].tolist(), bounds[:-1], bounds[1:]):
+            c._dates[keys[k]] = arrays["dates"][s:e]
+        return c
+
     def get_record_type(self, pathname):
         """gets the record type for a given path
 
@@ -21,15 +211,96 @@ class Catalog:
                 Returns:
                     RecordType: the record type :class:`hecdss.RecordType` of DSS data stored in this pathname
                 """
-        if pathname.lower() in self.recordTypeDict:
-            rt = self.recordTypeDict[pathname.lower()]
+        key = self._key(pathname)
+        locationKey = key[:3] + tuple(self._lower_of[i].get("") for i in (3, 4, 5))
+        for k in (key, self._series_key(key), locationKey):
+            if k in self._types:
+                return self._types[k]
+        raise KeyError(str(pathname).lower())
+
+    def block_dates(self, pathname):
+        """returns the sorted block dates (datetime) of the time-series of pathname, ignoring its D part"""
+        key = self._series_key(self._key(pathname))
+        return self._dates.get(key, np.empty(0, dtype="datetime64[D]")).astype("datetime64[s]").tolist()
+
+    @property
+    def recordTypeDict(self):
+        """dictionary of lowercase path (time-series without D part) to RecordType, built on request"""
+        return {self._path(k).lower(): rt for k, rt in self._types.items()}
+
+    @property
+    def timeSeriesDictNoDates(self):
+        """dictionary of lowercase time-series path without D part to its block dates, built on request"""
+        return {self._path(k).lower(): d.astype("datetime64[s]").tolist() for k, d in self._dates.items()}
+
+    @property
+    def items(self):
+        """condensed list of DssPath items; rebuilt only after the catalog has changed"""
+        if self._items is None:
+            self._items = self.__build_items()
+        return self._items
+
+    def notify_put(self, pathname, record_type):
+        """
+        updates the catalog after a record has been written, without rescanning the DSS file.
+
+        uncondensed_paths and rawRecordTypes are not changed; they describe the scan
+        this catalog was built from. For time-series, block dates are only added
+        when pathname includes a block D part such as '01Jan2020'.
+
+        Args:
+            pathname (str): dss pathname that was written
+            record_type (RecordType): record type that was written
+        """
+        pathname = str(pathname)
+        if record_type == RecordType.LocationInfo:
+            pathname = str(DssPath(pathname).path_location_info())
+        key = self._key(pathname, record_type, intern=True)
+        if key not in self._types:
+            self._order[key] = len(self._order)
+            self.__index_key(key, add=True)
+        self._types[key] = record_type
+        names = tuple(self._codes_of[i][part] for i, part in enumerate(_split_path(pathname)))
+        if record_type in _TIME_SERIES_TYPES:
+            self._names.setdefault(key, names)
         else:
-            path = DssPath(pathname, RecordType.Unknown)
-            if( path.path_without_date().__str__().lower() in self.recordTypeDict):
-                rt = self.recordTypeDict[path.path_without_date().__str__().lower()]
-            else:
-                rt = self.recordTypeDict[path.path_location_info().__str__().lower()]
-        return rt
+            self._names[key] = names
+        if record_type in _TIME_SERIES_TYPES:
+            t = _block_date(_split_path(pathname)[3])
+            if t is not None:
+                dates = self._dates.get(key, np.empty(0, dtype="datetime64[D]"))
+                self._dates[key] = np.union1d(dates, [np.datetime64(t, "D")])
+        self._items = None
+
+    def notify_delete(self, pathname):
+        """
+        updates the catalog after a record has been deleted, without rescanning the DSS file.
+
+        A time-series pathname with a block D part removes that block; any other
+        time-series pathname removes the whole series.
+
+        Args:
+            pathname (str): dss pathname that was deleted
+        """
+        key = self._key(pathname)
+        rt = self._types.get(key)
+        if rt is not None and rt not in _TIME_SERIES_TYPES:
+            self.__remove_key(key)
+        else:
+            key = self._series_key(key)
+            if key not in self._types:
+                return
+            dates = self._dates.get(key)
+            t = _block_date(_split_path(str(pathname))[3])
+            if dates is not None and t is not None:
+                dates = dates[dates != np.datetime64(t, "D")]
+                self._dates[key] = dates
+                if dates.size:
+                    self._items = None
+                    return
+            self.__remove_key(key)
+            self._dates.pop(key, None)
+        self._items = None
 
     def __create_condensed_catalog(self):
         """
@@ -37,56 +308,168 @@ class Catalog:
           other record types are not condensed.
           time-series records must match all parts except the D (date) part to be combined.
         """
-        self.items = []
-        raw_paths = {}
-        for i in range(len(self.uncondensed_paths)):
-            rawPath = self.uncondensed_paths[i]
-            recordType = RecordType.RecordTypeFromInt(self.rawRecordTypes[i])
-            path = DssPath(rawPath,recordType)
-            # if timeseries - accumulate dates within a dataset
-            if path.is_time_series():
-                cleanPath = str(path.path_without_date())
-                raw_paths[cleanPath.lower()] = rawPath
-                self.recordTypeDict[cleanPath.lower()] = recordType
-                if re.match(r"^\d{2}[A-Za-z]{3}\d{4}$", path.D):  # Check if path.D matches the format 'DDMMMYYYY'
-                    tsRecords = self.timeSeriesDictNoDates.setdefault(cleanPath.lower(), [])
-                    t = datetime.strptime(path.D,"%d%b%Y")
-                    tsRecords.append(t)
-            elif recordType in [RecordType.PairedData, RecordType.Grid, RecordType.Text,
-                                RecordType.LocationInfo, RecordType.Array]:
-                raw_paths[rawPath] = rawPath
-                self.recordTypeDict[str(path).lower()] = recordType
-                self.items.append(path)
+        raw = self.__intern_paths(self._paths)
+        self._paths = None
+        self._raw = raw
+        n = len(raw)
+        if n == 0:
+            return
+        # RecordType values, converted once per distinct raw record type
+        rawTypes, typeIndex = np.unique(np.asarray(self.rawRecordTypes, dtype=np.int32), return_inverse=True)
+        typeValues = np.array([RecordType.RecordTypeFromInt(int(t)).value for t in rawTypes], dtype=np.int32)
+        for v in typeValues:
+            if RecordType(v) not in _TIME_SERIES_TYPES and RecordType(v) not in _OTHER_TYPES:
+                raise Exception(f"unsupported record_type: {RecordType(v)}")
+        recordTypes = typeValues[typeIndex.reshape(-1)]
+        isSeries = np.isin(recordTypes, [rt.value for rt in _TIME_SERIES_TYPES])
+
+        keys = np.column_stack([np.array(self._fold[i], dtype=np.int32)[raw[:, i]] for i in range(6)])
+        keys[isSeries, 3] = _SERIES
+        uniqueKeys, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        last = np.zeros(len(uniqueKeys), dtype=np.int64)
+        np.maximum.at(last, inverse, np.arange(n))
+        keyList = list(map(tuple, uniqueKeys.tolist()))
+        # keys in order of their first record; the last record gives the record type and name
+        names = raw[last].tolist()
+        for g in np.argsort(first, kind="stable"):
+            self._types[keyList[g]] = RecordType(int(recordTypes[last[g]]))
+            self._order[keyList[g]] = len(self._order)
+            self._names[keyList[g]] = tuple(names[g])
+
+        # block dates, parsed once per distinct D part
+        dParts = np.array([_block_date(s) or np.datetime64("NaT") for s in self._strings[3]], dtype="datetime64[D]")
+        dates = dParts[raw[:, 3]]
+        dated = np.flatnonzero(isSeries & ~np.isnat(dates))
+        if dated.size == 0:
+            return
+        groups = inverse[dated]
+        order = np.lexsort((dates[dated], groups))
+        groups, dates = groups[order], dates[dated][order]
+        keep = np.ones(len(groups), dtype=bool)
+        keep[1:] = (groups[1:] != groups[:-1]) | (dates[1:] != dates[:-1])
+        groups, dates = groups[keep], dates[keep]
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        bounds = np.r_[starts, len(groups)]
+        # series in order of their first dated record
+        firstDated = np.full(len(uniqueKeys), n, dtype=np.int64)
+        np.minimum.at(firstDated, inverse[dated], dated)
+        ranges = {groups[s]: (s, e) for s, e in zip(bounds[:-1], bounds[1:])}
+        for g in sorted(ranges, key=lambda g: firstDated[g]):
+            s, e = ranges[g]
+            self._dates[keyList[g]] = dates[s:e]
+
+    def __intern_paths(self, paths, batch_size=16384):
+        """interns the parts of paths, a batch at a time; returns an (n, 6) int32 array of part codes"""
+        blocks = []
+        paths = iter(paths)
+        while True:
+            batch = list(islice(paths, batch_size))
+            if not batch:
+                break
+            columns = list(zip(*[p[1:-1].split('/') for p in batch]))
+            if len(columns) < 6 or any(p[:1] != '/' or p[-1:] != '/' for p in batch):
+                for p in batch:
+                    _split_path(p)  # raises for the invalid path
+            block = np.empty((len(batch), 6), dtype=np.int32)
+            for i in range(6):
+                codes_of = self._codes_of[i]
+                for part in dict.fromkeys(columns[i]):
+                    if part not in codes_of:
+                        self._intern(i, part)
+                block[:, i] = np.fromiter(map(codes_of.__getitem__, columns[i]), dtype=np.int32, count=len(batch))
+            blocks.append(block)
+        return np.concatenate(blocks) if blocks else np.empty((0, 6), dtype=np.int32)
+
+    def __remove_key(self, key):
+        self.__index_key(key, add=False)
+        del self._types[key]
+        del self._names[key]
+        del self._order[key]
+
+    def __index_key(self, key, add):
+        """adds key to, or removes it from, the part indexes (if they have been built)"""
+        if self._index is None:
+            return
+        for i, code in enumerate(key):
+            if i == 3 and code == _SERIES:
+                continue
+            if add:
+                self._index[i].setdefault(code, set()).add(key)
             else:
-                raise Exception(f"unsupported record_type: {recordType}")
+                self._index[i][code].discard(key)
 
+    def __match_codes(self, part, pattern):
+        """folded codes of the strings of part matching pattern ('*' and '?' wildcards, no case)"""
+        pattern = pattern.lower()
+        if "*" not in pattern and "?" not in pattern:
+            code = self._lower_of[part].get(pattern)
+            return [] if code is None else [code]
+        return [code for s, code in self._lower_of[part].items() if fnmatchcase(s, pattern)]
 
+    def find(self, A=None, B=None, C=None, D=None, E=None, F=None):
+        """finds items by pathname part, using an index of each part
 
-        # go through each timeSeriesDictNoDates, and sort each list of dates
-        # use first and last to create the condensed path 
-        for key in self.timeSeriesDictNoDates.keys():
-            dateList = sorted(self.timeSeriesDictNoDates[key])
-            condensedDpart = dateList[0].strftime("%d%b%Y")
-            if len(dateList) >1:
-                condensedDpart +="-"+ dateList[-1].strftime("%d%b%Y")
-            # insert condensed D part into path used as key
-            rt = self.recordTypeDict[key]
-            p = DssPath(raw_paths[key],rt)
-            p.D = condensedDpart
-            self.items.append(p)
+        Each part is matched without case and may use '*' and '?' wildcards; parts
+        not given match anything. A time-series matches D when one of its block dates does.
+
+        Args:
+            A, B, C, D, E, F (str, optional): pattern for that part of the pathname
+
+        Returns:
+            list: matching DssPath items, non time-series first, in the order they were added to the catalog.
+        """
+        if self._index is None:
+            self._index = [{} for _ in range(6)]
+            for key in self._types:
+                self.__index_key(key, add=True)
+        found = []
+        for i, pattern in enumerate((A, B, C, None, E, F)):
+            if pattern is not None:
+                sets = [self._index[i].get(code, ()) for code in self.__match_codes(i, pattern)]
+                found.append(sets[0] if len(sets) == 1 else set().union(*sets))
+        found.sort(key=len)
+        matches = set(found[0]).intersection(*found[1:]) if found else set(self._types)
+        if D is not None:
+            dCodes = set(self.__match_codes(3, D))
+            dates = [_block_date(self._strings[3][c]) for c in dCodes]
+            dates = np.array([t for t in dates if t is not None], dtype="datetime64[D]")
+            matches = {k for k in matches if (k[3] in dCodes if k[3] != _SERIES
+                                              else k in self._dates and np.isin(self._dates[k], dates).any())}
+        # time-series without block dates are not items
+        keys = [k for k in matches if k[3] != _SERIES or k in self._dates]
+        keys.sort(key=lambda k: (k[3] == _SERIES, self._order[k]))
+        return [self.__item(k) for k in keys]
+
+    def __item(self, key):
+        """DssPath item of key; a time-series gets a condensed D part from its first and last block date"""
+        p = DssPath(self._path(key), self._types[key])
+        if key[3] == _SERIES:
+            dates = self._dates[key]
+            p.D = dates[0].astype(datetime).strftime("%d%b%Y")
+            if len(dates) > 1:
+                p.D += "-" + dates[-1].astype(datetime).strftime("%d%b%Y")
+        return p
+
+    def __build_items(self):
+        """
+          non time-series items, followed by one condensed path per time-series
+        """
+        items = [self.__item(k) for k in self._types if k[3] != _SERIES]
+        items.extend(self.__item(k) for k in self._dates)
+        return items
 
     def print(self):
         for ds in self.items:
             print(ds)
 
     def __iter__(self):
-        self.index = 0  # Initialize the index to 0
-        return self
-
-    def __next__(self):
-        if self.index < len(self.items):
-            result = self.items[self.index]
-            self.index += 1
-            return result
-        else:
-            raise StopIteration
+        """yields the items; each loop has its own position, so loops can be nested.
+        When items has not been built, DssPath objects are created one at a time."""
+        if self._items is not None:
+            yield from list(self._items)
+            return
+        keys = [k for k in self._types if k[3] != _SERIES] + list(self._dates)
+        for key in keys:
+            if key in self._types:
+                yield self.__item(key)
@@ -1,6 +1,8 @@
 import copy
 from datetime import datetime, timedelta, time
 
+import numpy as np
+
 _sec = [
     31536000,
     2592000,
@@ -75,6 +77,10 @@ _time_string = [
     "1Second",
     "0Second"
 ]
+# DSS julian day zero is 31Dec1899
+_JULIAN_ZERO = np.datetime64("1899-12-31T00:00:00", "s")
+
+
 class DateConverter:
 
     @staticmethod
@@ -110,6 +116,21 @@ class DateConverter:
         time_obj = datetime.strptime(time_part, "%H:%M").time()
         return datetime.combine(dt.date(), time_obj)
 
+    @staticmethod
+    def datetime_from_grid_date(part: str):
+        """
+        convert a grid D or E part to python datetime
+        02FEB2020:0600 -> 2020-02-02 06:00:00
+        02FEB2020:2400 -> 2020-02-03 00:00:00
+        """
+        date_part, _, time_part = part.partition(":")
+        dt = datetime.strptime(date_part, "%d%b%Y")
+        if time_part:
+            hours = int(time_part[:2])
+            minutes = int(time_part[2:4] or 0)
+            dt += timedelta(hours=hours, minutes=minutes)
+        return dt
+
     @staticmethod
     def date_time_from_julian_second(time_julian, seconds_julian):
         """"
@@ -148,6 +169,34 @@ class DateConverter:
 
         return times
 
+    @staticmethod
+    def datetime64_from_julian_array(times_julian, time_granularity_seconds, julian_base_date):
+        """"
+        convert from DSS integer datetime array to a numpy datetime64[s] array (vectorized)
+        """
+        if times_julian is None:
+            raise ValueError("Time Series Times array was None. Something didn't work right in DSS.")
+        offsets = np.asarray(times_julian, dtype=np.int64) * int(time_granularity_seconds)
+        base = _JULIAN_ZERO + np.timedelta64(int(julian_base_date) * 86400, "s")
+        return base + offsets.astype("timedelta64[s]")
+
+    @staticmethod
+    def date_times_from_datetime64(times, tzinfo=None):
+        """"
+        convert a numpy datetime64 array to a list of python datetime, optionally attaching tzinfo
+        """
+        date_times = np.asarray(times).astype("datetime64[s]").tolist()
+        if tzinfo is not None:
+            date_times = [t.replace(tzinfo=tzinfo) for t in date_times]
+        return date_times
+
+    @staticmethod
+    def datetime64_from_date_times(date_times):
+        """"
+        convert a list of python datetime to a numpy datetime64[s] array (wall clock, tzinfo is dropped)
+        """
+        return np.array([t.replace(tzinfo=None) for t in date_times], dtype="datetime64[s]")
+
     @staticmethod
     def julian_array_from_date_times(date_times, time_granularity_seconds=60, start_date_base=(datetime(1900, 1, 1))):
         """"
@@ -158,6 +207,19 @@ class DateConverter:
         start_date_base = start_date_base.replace(hour=0, minute=0, second=0, microsecond=0)-timedelta(days=1)
         return [int(((i-start_date_base).days*86400 + i.hour * 3600 + i.minute * 60 + i.second)/time_granularity_seconds) for i in date_times]
 
+    @staticmethod
+    def julian_array_from_datetime64(times, time_granularity_seconds=60, start_date_base=(datetime(1900, 1, 1))):
+        """"
+        vectorized julian_array_from_date_times for a numpy datetime64 array; returns an int64 array
+        """
+        if times is None:
+            raise ValueError("Time Series Times array was None. Something didn't work right in DSS.")
+        start_date_base = start_date_base.replace(hour=0, minute=0, second=0, microsecond=0)-timedelta(days=1)
+        seconds = (times.astype("datetime64[s]") - np.datetime64(start_date_base, "s")).astype(np.int64)
+        if time_granularity_seconds == 1:
+            return seconds
+        return (seconds / time_granularity_seconds).astype(np.int64)
+
     @staticmethod
     def intervalString_to_sec(interval):
         if isinstance(interval, str):
@@ -0,0 +1,38 @@
+import numpy as np
+
+
+class GridStack:
+    """
+    Sequence of grids from one grid series (same A, B, C and F parts), in time order.
+
+    Properties:
+        id (str): pathname pattern the stack was read with.
+        pathnames (list): DSS pathname of each grid.
+        times (numpy.ndarray): datetime64[s] start time (D part) of each grid.
+        end_times (numpy.ndarray): datetime64[s] end time (E part) of each grid, NaT when the E part is empty.
+        data (numpy.ndarray): float32 array with shape (time, numberOfCellsY, numberOfCellsX).
+        info (GriddedData): header of the first grid (cell size, lower left cell, units, srs, ...).
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty GridStack.
+        """
+        self.id = None
+        self.pathnames = []
+        self.times = np.empty(0, dtype="datetime64[s]")
+        self.end_times = np.empty(0, dtype="datetime64[s]")
+        self.data = np.zeros((0, 0, 0), dtype=np.float32)
+        self.info = None
+
+    def __len__(self):
+        return len(self.pathnames)
+
+    def get_grid_at(self, index):
+        """
+        Returns the grid at index, as a (numberOfCellsY, numberOfCellsX) view of the stack.
+
+        Args:
+            index (int): position in the time axis.
+        """
+        return self.data[index]
@@ -1,4 +1,5 @@
 # import pandas as pd
+import copy
 import numpy as np
 import math
 
@@ -49,7 +50,7 @@ class GriddedData:
         meanDataValue (float): Mean data value.
         rangeLimitTable (list): Range limit table.
         numberEqualOrExceedingRangeLimit (list): Number equal or exceeding range limit.
-        data (numpy.ndarray): Data array.
+        data (numpy.ndarray): float32 cell values, with shape (numberOfCellsY, numberOfCellsX).
     """
 
     def __init__(self):
@@ -110,9 +111,11 @@ class GriddedData:
         self.rangeLimitTable[2:] = minval + step * np.arange(2, bins)
 
         self.rangeLimitTable[bins - 1] = maxval
-        # Exceedance
-        mask = data[None, :] >= self.rangeLimitTable[:, None]
-        self.numberEqualOrExceedingRangeLimit = mask.sum(axis=1)
+        # Exceedance: count of values >= each limit, from one sorted copy of the data
+        # (NaN sorts last and never exceeds a limit)
+        sorted_data = np.sort(data, axis=None)
+        n = np.searchsorted(sorted_data, np.nan, side="left")
+        self.numberEqualOrExceedingRangeLimit = n - np.searchsorted(sorted_data[:n], self.rangeLimitTable, side="left")
 
     def update_grid_info(self):
         """
@@ -121,16 +124,105 @@ class GriddedData:
         self.numberOfCellsX = len(self.data[0])
         self.numberOfCellsY = len(self.data)
         n = np.size(self.data)
-        self.maxDataValue = np.nanmax(self.data)
-        self.minDataValue = np.nanmin(self.data)
-        bin_range = int(math.ceil(self.maxDataValue) - math.floor(self.minDataValue))
-        self.meanDataValue = np.nanmean(self.data)
+        # statistics of the defined cells only; with none, they are NULL_INT
+        valid = self.data[~np.isnan(self.data) & (self.data != NULL_INT)]
+        if valid.size:
+            self.maxDataValue = valid.max()
+            self.minDataValue = valid.min()
+            self.meanDataValue = valid.mean()
+            bin_range = int(math.ceil(self.maxDataValue) - math.floor(self.minDataValue))
+        else:
+            self.maxDataValue = self.minDataValue = self.meanDataValue = NULL_INT
+            bin_range = 0
 
         self.data = np.nan_to_num(self.data, nan=NULL_INT)
         self.numberOfRanges = math.floor(2 + 3.322 * math.log10(n))
-        flat_data = self.data.flatten()
+        flat_data = self.data.ravel()
         self.range_limit_table(self.minDataValue, self.maxDataValue, bin_range, self.numberOfRanges, n, flat_data)
 
+    def bbox_to_cells(self, x0, y0, x1, y1):
+        """
+        Convert a bounding box in map coordinates to the cell window that covers it.
+
+        Args:
+            x0, y0 (float): lower left corner of the box.
+            x1, y1 (float): upper right corner of the box.
+
+        Returns:
+            tuple: (min_cell_x, min_cell_y, max_cell_x, max_cell_y), max values exclusive,
+            in the same cell system as lowerLeftCellX and lowerLeftCellY.
+        """
+        min_cell_x = math.floor((x0 - self.xCoordOfGridCellZero) / self.cellSize)
+        min_cell_y = math.floor((y0 - self.yCoordOfGridCellZero) / self.cellSize)
+        max_cell_x = math.ceil((x1 - self.xCoordOfGridCellZero) / self.cellSize)
+        max_cell_y = math.ceil((y1 - self.yCoordOfGridCellZero) / self.cellSize)
+        return min_cell_x, min_cell_y, max_cell_x, max_cell_y
+
+    def cells_in_polygon(self, vertices):
+        """
+        Find the cells of this grid whose centers fall inside a polygon.
+
+        Args:
+            vertices (list): (x, y) polygon vertices in map coordinates; the polygon is closed
+                automatically.
+
+        Returns:
+            numpy.ndarray: (n_cells, 2) int array of (cell_x, cell_y) indices, in the same cell system
+            as lowerLeftCellX and lowerLeftCellY, ordered row by row from the lower (south) edge.
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        cell_x = np.arange(self.lowerLeftCellX, self.lowerLeftCellX + self.numberOfCellsX)
+        cell_y = np.arange(self.lowerLeftCellY, self.lowerLeftCellY + self.numberOfCellsY)
+        x = self.xCoordOfGridCellZero + (cell_x + 0.5) * self.cellSize
+        y = self.yCoordOfGridCellZero + (cell_y + 0.5) * self.cellSize
+        px, py = np.meshgrid(x, y)
+        inside = np.zeros(px.shape, dtype=bool)
+        # even-odd rule: count polygon edges crossed by a ray from each center toward +x
+        for (x0, y0), (x1, y1) in zip(vertices, np.roll(vertices, -1, axis=0)):
+            if y0 == y1:
+                continue
+            crosses = (y0 > py) != (y1 > py)
+            x_cross = x0 + (py - y0) * (x1 - x0) / (y1 - y0)
+            inside ^= crosses & (px < x_cross)
+        rows, cols = np.nonzero(inside)
+        return np.column_stack((cell_x[cols], cell_y[rows]))
+
+    def window(self, min_cell_x, min_cell_y, max_cell_x, max_cell_y):
+        """
+        Create a new GriddedData holding a rectangular window of this grid.
+
+        Cell indices use the same system as lowerLeftCellX and lowerLeftCellY, max values are
+        exclusive, and the window is clipped to the grid. The window data is a copy, so it does
+        not keep this grid's data alive. lowerLeftCellX/Y, the cell counts and the statistics
+        are updated for the window.
+
+        Args:
+            min_cell_x, min_cell_y (int): first cell of the window.
+            max_cell_x, max_cell_y (int): cell after the last cell of the window.
+
+        Raises:
+            ValueError: if the window does not overlap the grid.
+
+        Returns:
+            GriddedData: the window.
+        """
+        x0 = max(min_cell_x, self.lowerLeftCellX)
+        y0 = max(min_cell_y, self.lowerLeftCellY)
+        x1 = min(max_cell_x, self.lowerLeftCellX + self.numberOfCellsX)
+        y1 = min(max_cell_y, self.lowerLeftCellY + self.numberOfCellsY)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError(f"window ({min_cell_x}, {min_cell_y}, {max_cell_x}, {max_cell_y}) does not overlap the grid")
+
+        gd = copy.copy(self)
+        gd.lowerLeftCellX = x0
+        gd.lowerLeftCellY = y0
+        # data rows run from the lower (south) edge upward
+        rows = slice(y0 - self.lowerLeftCellY, y1 - self.lowerLeftCellY)
+        cols = slice(x0 - self.lowerLeftCellX, x1 - self.lowerLeftCellX)
+        gd.data = np.array(self.data[rows, cols])
+        gd.update_grid_info()
+        return gd
+
     @staticmethod
     def create(path=None,
         type = 420,
@@ -1,4 +1,11 @@
 """Docstring for public module."""
+import codecs
+import copy
+import hashlib
+import os
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -14,11 +21,94 @@ from hecdss.dateconverter import DateConverter
 from hecdss.record_type import RecordType
 from hecdss.regular_timeseries import RegularTimeSeries
 from hecdss.irregular_timeseries import IrregularTimeSeries
-from hecdss.catalog import Catalog
+from hecdss.catalog import Catalog, CatalogRecord
 from hecdss.gridded_data import GriddedData
+from hecdss.grid_stack import GridStack
 from hecdss.dsspath import DssPath
+from hecdss.dss_type import DssType
 
 DSS_UNDEFINED_VALUE = -340282346638528859811704183484516925440.000000
+LOCATION_CACHE_SIZE = 256  # LocationInfo records kept per open file
+RECORD_TYPE_CACHE_SIZE = 4096  # record types kept per open file
+TEXT_INITIAL_SIZE = 1024  # first read buffer for a text record of unknown size, in bytes
+TEXT_GROWTH = 8  # read buffer growth factor while a text record does not fit
+TEXT_MAX_SIZE = 2 * 1048576  # default largest text read buffer, in bytes (2 MB)
+_GRID_DATA_TYPES = [str(DssType.PER_AVER), str(DssType.PER_CUM), str(DssType.INST_VAL), str(DssType.INST_CUM)]
+# DSS block length of irregular time-series, by E part
+_IRREGULAR_BLOCKS = {"ir-day": "D", "ir-month": "M", "ir-year": "Y", "ir-decade": 10, "ir-century": 100}
+
+
+def _regular_block(interval_seconds):
+    """DSS block length of a regular interval: a numpy unit, a number of years, or None"""
+    if interval_seconds == "empty" or interval_seconds < 60:
+        return None
+    if interval_seconds <= 360:
+        return "D"
+    if interval_seconds <= 3600:
+        return "M"
+    if interval_seconds <= 86400:
+        return "Y"
+    if interval_seconds <= 2592000:
+        return 10
+    return 100
+
+
+def _block_starts(start, end, block):
+    """datetimes of the DSS block starts after start and before end"""
+    if block in ("D", "M", "Y"):
+        starts = np.arange(np.datetime64(start, block) + 1, np.datetime64(end, block) + 1)
+    else:
+        years = np.arange(start.year // block * block + block, end.year + 1, block)
+        starts = (years - 1970).astype("datetime64[Y]")
+    return [d for d in starts.astype("datetime64[s]").tolist() if start < d < end]
+
+
+def _regular_axis(times, interval):
+    """(positions, axis): the regular axis at interval (an E part) from times[0] and where each time falls on it
+
+    Raises ValueError if a time is not on the axis.
+    """
+    seconds = DateConverter.intervalString_to_sec(interval)
+    if not isinstance(seconds, int):
+        raise ValueError(f"'{interval}' is not a regular interval")
+    times = np.asarray(times, dtype="datetime64[s]")
+    months = {"1Month": 1, "1Year": 12}.get(str(interval).title())
+    if months:
+        month = times.astype("datetime64[M]")
+        offsets = times - month.astype("datetime64[s]")
+        steps = (month - month[0]).astype(np.int64)
+        on_axis = (steps % months == 0) & (offsets == offsets[0])
+        positions = steps // months
+        axis = (month[0] + np.arange(positions[-1] + 1) * months).astype("datetime64[s]") + offsets[0]
+    else:
+        steps = (times - times[0]).astype(np.int64)
+        on_axis = steps % seconds == 0
+        positions = steps // seconds
+        axis = times[0] + np.arange(positions[-1] + 1) * np.timedelta64(seconds, "s")
+    if not np.all(on_axis) or np.any(np.diff(positions) <= 0):
+        raise ValueError(f"times are not at a {interval} interval")
+    return positions, axis
+
+
+def _block_d_parts(times, block):
+    """D parts ('01Jan1990') of the DSS blocks holding times; a time at midnight ends the previous day"""
+    t = np.asarray(times, dtype="datetime64[s]") - np.timedelta64(1, "s")
+    if block in ("D", "M", "Y"):
+        starts = np.unique(t.astype(f"datetime64[{block}]"))
+    else:
+        years = t.astype("datetime64[Y]").astype(np.int64) + 1970
+        starts = (np.unique(years // block * block) - 1970).astype("datetime64[Y]")
+    return [d.strftime("%d%b%Y") for d in starts.astype("datetime64[D]").tolist()]
+
+
+def _compress_grid(gd, update_info):
+    """returns a copy of gd without data, and its zlib compressed float32 data (runs in put_grids workers)"""
+    gd = copy.copy(gd)
+    if update_info:
+        gd.update_grid_info()
+    compressed = zlib.compress(np.ascontiguousarray(gd.data, dtype=np.float32).tobytes())
+    gd.data = np.zeros(0, dtype=np.float32)
+    return gd, compressed
 
 
 class HecDss:
@@ -34,6 +124,10 @@ class HecDss:
         self._native = _Native()
         self._native.hec_dss_open(filename)
         self._catalog = None
+        self._location_cache = OrderedDict()  # location path (lowercase) -> LocationInfo or None
+        self._record_types = OrderedDict()  # path (lowercase, time-series without D part) -> RecordType
+        self._grid_headers = {}  # grid series key -> (numberOfCellsX, numberOfCellsY, numberOfRanges)
+        self._text_sizes = {}  # text pathname (lowercase) -> read buffer size known to fit
         self._filename = filename
         self._closed = False
 
@@ -73,6 +167,24 @@ class HecDss:
         """
         # Set the native DLL level (controls what gets written)
         _Native().hec_dss_set_debug_level(level)
+
+    @staticmethod
+    def get_native_call_counts() -> dict:
+        """
+        Gets the number of calls made to each native hecdss function in this process.
+
+        Returns:
+            dict: function name -> number of calls
+        """
+        return _Native.call_counts()
+
+    @staticmethod
+    def reset_native_call_counts() -> None:
+        """
+        Resets the native call counters returned by get_native_call_counts.
+        """
+        _Native.reset_call_counts()
+
     def close(self):
         """closes the DSS file and releases any locks
         """
@@ -84,23 +196,66 @@ class HecDss:
         """
         Get the record type for a given DSS pathname.
 
+        The type is looked up in the DSS file for this path only, the full catalog is not read.
+        Time-series paths may be condensed (any D part, or none).
+
         Args:
             pathname (str): The DSS pathname for which to get the record type.
 
+        Raises:
+            KeyError: if there is no record for pathname.
+
         Returns:
             RecordType: The record type of the given DSS pathname.
         """
-        if not self._catalog:
-            self._catalog = self.get_catalog()
-        rt = self._catalog.get_record_type(pathname)
-
-        # print(f"hec_dss_recordType for '{pathname}' is {rt}")
-        # TODO do native call.
-        # rt = self._native.hec_dss_recordType(pathname)
-        # print(f"hec_dss_recordType for '{pathname}' is {rt}")
+        pathname = str(pathname)
+        if self._catalog is not None:
+            return self._catalog.get_record_type(pathname)
+        rt = self._cached_record_type(pathname)
+        if rt is not None:
+            return rt
+
+        dsspath = DssPath(pathname)
+        key = pathname.lower()
+        rt = self._find_record_type(pathname, dsspath)
+        if rt is None:
+            raise KeyError(key)
+        if rt in (RecordType.RegularTimeSeries, RecordType.IrregularTimeSeries):
+            key = str(dsspath.path_without_date()).lower()
+        self._record_types[key] = rt
+        if len(self._record_types) > RECORD_TYPE_CACHE_SIZE:
+            self._record_types.popitem(last=False)
         return rt
 
-    def get(self, pathname: str, startdatetime=None, enddatetime=None, trim=False):
+    def _cached_record_type(self, pathname: str):
+        key = pathname.lower()
+        for k in (key, str(DssPath(pathname).path_without_date()).lower()):
+            if k in self._record_types:
+                self._record_types.move_to_end(k)
+                return self._record_types[k]
+        return None
+
+    def _find_record_type(self, pathname: str, dsspath: DssPath):
+        rt = RecordType.RecordTypeFromInt(self._native.hec_dss_recordType(pathname))
+        if rt != RecordType.Unknown:
+            return rt
+        # condensed time-series path, look for one of its blocks
+        seriesPath = str(dsspath.path_without_date()).lower()
+        pathFilter = f"/{dsspath.A}/{dsspath.B}/{dsspath.C}/*/{dsspath.E}/{dsspath.F}/"
+        for path, recordType in self._native.hec_dss_catalog_iter(pathFilter):
+            if str(DssPath(path).path_without_date()).lower() == seriesPath:
+                return RecordType.RecordTypeFromInt(recordType)
+        rt = RecordType.RecordTypeFromInt(self._native.hec_dss_recordType(str(dsspath.path_location_info())))
+        if rt == RecordType.LocationInfo:
+            return rt
+        return None
+
+    def _forget_record_type(self, pathname: str):
+        dsspath = DssPath(pathname)
+        self._record_types.pop(str(pathname).lower(), None)
+        self._record_types.pop(str(dsspath.path_without_date()).lower(), None)
+
+    def get(self, pathname: str, startdatetime=None, enddatetime=None, trim=False, with_location=True, bbox=None):
         pathname = str(pathname)
         type = self.get_record_type(pathname)
         """gets various types of data from the current DSS file
@@ -109,9 +264,11 @@ class HecDss:
             pathname (str): dss pathname
             startdatetime (datetime): start date for query
             enddatetime (datetime): end date for the query
+            with_location (bool): read the location info for the record. Defaults to True.
+            bbox (tuple, optional): for grids, (x0, y0, x1, y1) in map coordinates; read only that window.
 
         Returns:
-            varies: RegularTimeSeries, PairedData, Grid, or Array.
+            varies: RegularTimeSeries, PairedData, Grid (float32 data), or Array.
         """
         if type == RecordType.RegularTimeSeries or type == RecordType.IrregularTimeSeries:
             new_pathname = pathname
@@ -119,68 +276,546 @@ class HecDss:
                 new_pathname = DssPath(pathname).path_without_date().__str__()
             elif type == RecordType.IrregularTimeSeries:
                 raise ValueError("ts-pattern is not fully supported for irregular time series")
-            ts = self._get_timeseries(new_pathname, startdatetime, enddatetime, trim)
+            ts = self._get_timeseries(new_pathname, startdatetime, enddatetime, trim, type, with_location)
             return ts
         elif type == RecordType.PairedData:
-            return self._get_paired_data(pathname)
+            return self._get_paired_data(pathname, with_location)
             # read paired data
         elif type == RecordType.Grid:
-            return self._get_gridded_data(pathname)
+            if bbox is not None:
+                return self.get_grid(pathname, with_location=with_location, bbox=bbox)
+            return self._get_gridded_data(pathname, with_location)
         elif type == RecordType.Array:
-            return self._get_array(pathname)
+            return self._get_array(pathname, with_location)
         elif type == RecordType.LocationInfo:
             return self._get_location_info(pathname)
         elif type == RecordType.Text:
             return self._get_text(pathname)
         return None
 
+    def get_many(self, pathnames, startdatetime=None, enddatetime=None, trim=False, with_location=True, stack=False):
+        """gets several time-series records, sharing the catalog lookup and retrieve buffers
+
+        When more than one record type is not yet known, the full catalog is read once and kept,
+        see :meth:`get_catalog`.
+
+        Args:
+            pathnames (list[str]): dss pathnames of time-series records
+            startdatetime (datetime): start date for query
+            enddatetime (datetime): end date for the query
+            trim (bool): remove missing values at the start and end, as in get
+            with_location (bool): read the location info of each record. Defaults to True.
+            stack (bool): return a single array instead of a dict. All records must be
+                regular time-series with the same times.
+
+        Raises:
+            ValueError: if a record is not a time-series, or stack is True and the times do not match.
+
+        Returns:
+            dict: pathname -> RegularTimeSeries or IrregularTimeSeries, or when stack is True,
+            a tuple (times, values) of a datetime64 array and a 2-D array with one row per pathname.
+        """
+        pathnames = [str(p) for p in pathnames]
+        if self._catalog is None:
+            # several unknown paths: one catalog read instead of a lookup per path, kept for later gets
+            unknown = [p for p in pathnames if self._cached_record_type(p) is None]
+            if len(unknown) > 1:
+                self.get_catalog()
+        scratch = {}
+        results = {}
+        for pathname in pathnames:
+            rt = self.get_record_type(pathname)
+            if rt != RecordType.RegularTimeSeries and rt != RecordType.IrregularTimeSeries:
+                raise ValueError(f"'{pathname}' is not a time-series record: {rt}")
+            dsspath = DssPath(pathname)
+            new_pathname = pathname
+            if dsspath.D.lower() != "ts-pattern":
+                new_pathname = str(dsspath.path_without_date())
+            elif rt == RecordType.IrregularTimeSeries:
+                raise ValueError("ts-pattern is not fully supported for irregular time series")
+            results[pathname] = self._get_timeseries(new_pathname, startdatetime, enddatetime, trim, rt,
+                                                     with_location, scratch)
+
+        if not stack:
+            return results
+
+        series = list(results.values())
+        if not series:
+            return np.empty(0, dtype="datetime64[s]"), np.empty((0, 0))
+        times = series[0].times64
+        for ts in series:
+            if type(ts) is not RegularTimeSeries or ts.interval != series[0].interval:
+                raise ValueError(f"cannot stack '{ts.id}', all records must be regular time-series with the same interval")
+            if not np.array_equal(ts.times64, times):
+                raise ValueError(f"cannot stack '{ts.id}', times do not match '{series[0].id}'")
+        values = np.empty((len(series), len(times)), dtype=np.float64)
+        for i, ts in enumerate(series):
+            values[i] = ts.values
+        return times, values
+
+    def iter_timeseries(self, pathname: str, startdatetime=None, enddatetime=None, chunk=None):
+        """reads a time-series one DSS block at a time, so long records can be processed with bounded memory
+
+        Blocks are taken from the D parts in the catalog, or from the DSS block length of the
+        interval when the catalog does not list them. Location info is not read.
+
+        Args:
+            pathname (str): dss pathname
+            startdatetime (datetime): start date for query. Defaults to the first stored value.
+            enddatetime (datetime): end date for the query. Defaults to the last stored value.
+            chunk (int, optional): for regular time-series, the maximum number of values read at once.
+                Defaults to None (one read per block).
+
+        Raises:
+            ValueError: if the record is not a time-series, or is a ts-pattern.
+
+        Yields:
+            tuple: (times, values) numpy arrays of datetime64[s] and float64
+        """
+        pathname = str(pathname)
+        rt = self.get_record_type(pathname)
+        if rt != RecordType.RegularTimeSeries and rt != RecordType.IrregularTimeSeries:
+            raise ValueError(f"'{pathname}' is not a time-series record: {rt}")
+        dsspath = DssPath(pathname)
+        if dsspath.D.lower() == "ts-pattern":
+            raise ValueError("ts-pattern is not supported by iter_timeseries")
+        new_pathname = str(dsspath.path_without_date())
+
+        first, last = self._get_date_time_range(new_pathname, 1)
+        start = startdatetime if startdatetime else first
+        end = enddatetime if enddatetime else last
+        catalog = self._catalog
+        if catalog is None:
+            catalog = self.get_catalog(f"/{dsspath.A}/{dsspath.B}/{dsspath.C}/*/{dsspath.E}/{dsspath.F}/")
+        dates = [d for d in catalog.block_dates(new_pathname) if start < d < end]
+        if not dates:
+            # the catalog does not list the blocks, use the DSS block length of the interval
+            if rt == RecordType.RegularTimeSeries:
+                block = _regular_block(DateConverter.intervalString_to_sec(dsspath.E))
+            else:
+                block = _IRREGULAR_BLOCKS.get(dsspath.E.lower())
+            if block is not None:
+                dates = _block_starts(start, end, block)
+        edges = [start] + dates + [end]
+        step = None
+        if chunk and rt == RecordType.RegularTimeSeries:
+            step = timedelta(seconds=chunk * DateConverter.intervalString_to_sec(dsspath.E))
+
+        scratch = {}
+        last_time = None
+        for block_start, block_end in zip(edges[:-1], edges[1:]):
+            window_start = block_start
+            while True:
+                window_end = block_end if step is None else min(block_end, window_start + step)
+                ts = self._get_timeseries(new_pathname, window_start, window_end, False, rt, False, scratch)
+                times = ts.times64
+                values = ts.values
+                # read windows share their end points
+                if last_time is not None and len(times):
+                    keep = times > last_time
+                    times = times[keep]
+                    values = values[keep]
+                if len(times):
+                    last_time = times[-1]
+                    yield times, values
+                if window_end >= block_end:
+                    break
+                window_start = window_end
+
     def _get_text(self, pathname: str):
-        textLength = 1024
+        return self.get_text(pathname)
 
+    def get_text(self, pathname: str, max_size: int = TEXT_MAX_SIZE):
+        """reads a text record
 
-        BUFFER_TOO_SMALL = -17
-        textArray = []
-        status = self._native.hec_dss_textRetrieve(pathname, textArray, textLength)
-        while status == BUFFER_TOO_SMALL:
-            textLength *= 2
-            if textLength > 2*1048576:  # 2 MB
-                print(f"Text record too large to read from '{pathname}'")
-                return None
-            textArray = [] # otherwise we get an entry for each attempt
-            status = self._native.hec_dss_textRetrieve(pathname, textArray, textLength)
+        The library cannot report the size of a text record, so the read buffer grows
+        until the text fits. The size that worked is remembered for the next read of the
+        same record, and text written by this HecDss is read in a single call, whatever its size.
+
+        Args:
+            pathname (str): dss pathname of the text record
+            max_size (int, optional): largest read buffer to try for a record of unknown size,
+                in bytes. Defaults to TEXT_MAX_SIZE.
 
+        Raises:
+            ValueError: if the size of the record is not known and it is larger than max_size.
+
+        Returns:
+            Text: the text record, or None on error.
+        """
+        status, c_buffer = self._read_text(pathname, max_size)
         if status != 0:
-            print(f"Error reading text from '{pathname}'")
             return None
         text = Text()
         text.id = pathname
-        text.text = textArray[0]
+        text.text = c_buffer.value.decode("utf-8")
         return text
 
-    def _get_array(self, pathname: str):
+    def iter_text(self, pathname: str, chunk_size: int = 65536, max_size: int = TEXT_MAX_SIZE):
+        """yields a text record in pieces, decoded straight from the read buffer
+
+        A very large text record is never held as one Python string.
+
+        Args:
+            pathname (str): dss pathname of the text record
+            chunk_size (int, optional): bytes decoded per piece. Defaults to 65536.
+            max_size (int, optional): largest read buffer to try for a record of unknown size,
+                in bytes. Defaults to TEXT_MAX_SIZE.
+
+        Raises:
+            ValueError: if the record cannot be read, or its size is not known and it is larger than max_size.
+
+        Yields:
+            str: consecutive pieces of the text.
+        """
+        status, c_buffer = self._read_text(pathname, max_size)
+        if status != 0:
+            raise ValueError(f"unable to read text from '{pathname}'")
+        raw = np.frombuffer(c_buffer, dtype=np.uint8)
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for start in range(0, raw.size, chunk_size):
+            chunk = raw[start:start + chunk_size].tobytes()
+            nul = chunk.find(b"\0")
+            if nul >= 0:
+                chunk = chunk[:nul]
+            piece = decoder.decode(chunk, final=nul >= 0)
+            if piece:
+                yield piece
+            if nul >= 0:
+                return
+
+    def _read_text(self, pathname, max_size):
+        """returns (status, ctypes buffer) of a text record, growing the buffer until it fits
+
+        a size already known for the record (from a write or an earlier read) is used as is,
+        max_size only bounds the search for the size of other records.
+        """
+        BUFFER_TOO_SMALL = -17
+        key = pathname.lower()
+        textLength = self._text_sizes.get(key)
+        if textLength is None:
+            textLength = min(TEXT_INITIAL_SIZE, max_size)
+        while True:
+            textArray = []
+            status = self._native.hec_dss_textRetrieve(pathname, textArray, textLength, decode=False)
+            if status != BUFFER_TOO_SMALL:
+                break
+            if textLength >= max_size:
+                self._text_sizes.pop(key, None)
+                raise ValueError(f"Text record '{pathname}' is larger than {max_size} bytes, "
+                                 f"read it with a larger max_size")
+            textLength = min(textLength * TEXT_GROWTH, max_size)
+
+        if status != 0:
+            print(f"Error reading text from '{pathname}'")
+            return status, None
+        self._text_sizes[key] = textLength
+        return status, textArray[0]
+
+    def _get_array(self, pathname: str, with_location=True):
         intValuesCount = [0]
         floatValuesCount = [0]
         doubleValuesCount = [0]
 
         self._native.hec_dss_arrayRetrieveInfo(pathname, intValuesCount, floatValuesCount, doubleValuesCount)
 
-        intValues = []
-        floatValues = []
-        doubleValues = []
+        intValues = np.zeros(intValuesCount[0], dtype=np.int32)
+        floatValues = np.zeros(floatValuesCount[0], dtype=np.float32)
+        doubleValues = np.zeros(doubleValuesCount[0], dtype=np.float64)
+
+        self._native.hec_dss_arrayRetrieve(pathname, intValues, floatValues, doubleValues)
+        location_info = self._get_location_info(pathname) if with_location else None
+        rval = ArrayContainer.create_array_container(path=pathname, location_info=location_info)
+        # keep the arrays the library filled, rather than copies
+        rval.int_values = intValues
+        rval.float_values = floatValues
+        rval.double_values = doubleValues
+        return rval
 
-        if intValuesCount[0] > 0:
-            intValues = [0] * intValuesCount[0]
-        if floatValuesCount[0] > 0:
-            floatValues = [0] * floatValuesCount[0]
-        if doubleValuesCount[0] > 0:
-            doubleValues = [0] * doubleValuesCount[0]
+    def get_grid(self, pathname: str, out: np.ndarray = None, with_location=True, bbox=None, window=None):
+        """reads a grid with one native call, into a float32 buffer that can be reused between grids
 
-        status = self._native.hec_dss_arrayRetrieve(pathname, intValues, floatValues, doubleValues)
-        location_info = self._get_location_info(pathname)
-        rval = ArrayContainer.create_array_container(intValues, floatValues, doubleValues, path=pathname, location_info=location_info)
-        return rval
+        The grid dimensions are cached per grid series (A, B, C and F parts), so only the
+        first grid of a series needs an extra call to read its header.
+
+        With bbox or window the whole grid is still decoded by the DSS library, into out or
+        a buffer released when this call returns, and only a copy of the window is returned.
+
+        Args:
+            pathname (str): dss pathname of the grid
+            out (numpy.ndarray, optional): C-contiguous float32 array with at least
+                numberOfCellsX * numberOfCellsY elements. Defaults to None (a new array).
+            with_location (bool): read the location info for the record. Defaults to True.
+            bbox (tuple, optional): (x0, y0, x1, y1) in map coordinates; return only the cells it covers.
+            window (tuple, optional): (min_cell_x, min_cell_y, max_cell_x, max_cell_y) cell indices,
+                max exclusive, see :meth:`GriddedData.window`.
+
+        Raises:
+            ValueError: if out is not a C-contiguous float32 array, or is too small,
+                or the window does not overlap the grid.
+
+        Returns:
+            GriddedData: grid whose data is a (numberOfCellsY, numberOfCellsX) view of out, or None on error.
+        """
+        pathname = str(pathname)
+        if bbox is None and window is None:
+            return self._get_gridded_data(pathname, with_location, out)
+
+        # without out, the full grid buffer only lives until the window is copied
+        gd = self._get_gridded_data(pathname, with_location, out)
+        if gd is None:
+            return None
+        if window is None:
+            window = gd.bbox_to_cells(*bbox)
+        return gd.window(*window)
+
+    def get_grid_stack(self, pattern: str, startdatetime=None, enddatetime=None, max_workers=None, bbox=None):
+        """reads every grid of a grid series within a time window into one (time, y, x) array
+
+        Grids are found in the catalog by the A, B, C and F parts of pattern, and sorted by their D part.
+
+        Args:
+            pattern (str): dss pathname of the grid series; the D and E parts are ignored,
+                for example "/SHG/TRUCKEE RIVER/PRECIP///NEXRAD/"
+            startdatetime (datetime, optional): keep grids starting at or after this time
+            enddatetime (datetime, optional): keep grids ending at or before this time
+            max_workers (int, optional): number of threads reading grids, each with its own
+                handle to the DSS file. Defaults to None (read on this thread).
+            bbox (tuple, optional): (x0, y0, x1, y1) in map coordinates; stack only the cells it covers.
+                The full grids are decoded into one reused buffer per reading handle.
+
+        Raises:
+            ValueError: if the grids do not all have the same dimensions and lower left cell.
 
-    def _get_gridded_data(self, pathname):
+        Returns:
+            GridStack: :class:`GridStack`, empty if no grid matched.
+        """
+        grids = self._find_grids(pattern, startdatetime, enddatetime)
+
+        stack = GridStack()
+        stack.id = str(pattern)
+        if not grids:
+            return stack
+        stack.pathnames = [g[2] for g in grids]
+        stack.times = np.array([g[0] for g in grids], dtype="datetime64[s]")
+        stack.end_times = np.array([g[1] if g[1] else np.datetime64("NaT") for g in grids], dtype="datetime64[s]")
+
+        first = self.get_grid(stack.pathnames[0], with_location=False)
+        if first is None:
+            raise ValueError(f"unable to read grid '{stack.pathnames[0]}'")
+        # with bbox, each reading handle decodes the full grids into one scratch buffer of this size
+        grid_size = first.data.size
+        if bbox is not None:
+            first = first.window(*first.bbox_to_cells(*bbox))
+        shape = first.data.shape
+        stack.data = np.empty((len(grids),) + shape, dtype=np.float32)
+        stack.data[0] = first.data
+        first.data = stack.data[0]
+        stack.info = first
+
+        lower_left = (first.lowerLeftCellX, first.lowerLeftCellY)
+
+        def read(dss, indices):
+            scratch = None if bbox is None else np.empty(grid_size, dtype=np.float32)
+            for i in indices:
+                if bbox is None:
+                    gd = dss.get_grid(stack.pathnames[i], out=stack.data[i], with_location=False)
+                else:
+                    gd = dss.get_grid(stack.pathnames[i], out=scratch, with_location=False, bbox=bbox)
+                if gd is None:
+                    raise ValueError(f"unable to read grid '{stack.pathnames[i]}'")
+                if gd.data.shape != shape:
+                    raise ValueError(f"grid '{stack.pathnames[i]}' has shape {gd.data.shape}, expected {shape}")
+                if (gd.lowerLeftCellX, gd.lowerLeftCellY) != lower_left:
+                    raise ValueError(f"grid '{stack.pathnames[i]}' does not line up with '{stack.pathnames[0]}'")
+                if bbox is not None:
+                    stack.data[i] = gd.data
+
+        def read_with_own_handle(indices):
+            with HecDss(self._filename) as dss:
+                read(dss, indices)
+
+        remaining = list(range(1, len(grids)))
+        if not max_workers or max_workers < 2 or len(remaining) < 2:
+            read(self, remaining)
+        else:
+            # contiguous runs of grids, so each handle reads in file order
+            chunks = [c.tolist() for c in np.array_split(remaining, min(max_workers, len(remaining)))]
+            with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+                for future in [pool.submit(read_with_own_handle, c) for c in chunks]:
+                    future.result()
+
+        return stack
+
+    def get_grid_cells(self, pattern: str, cells=None, mask=None, startdatetime=None, enddatetime=None, pathnames=None):
+        """reads selected cells from every grid of a grid series within a time window, in time order
+
+        Grids are read one at a time into a single reused buffer and only the selected cells are
+        kept, so memory grows with the number of grids and cells, not with the grid size.
+
+        Args:
+            pattern (str): dss pathname of the grid series; the D and E parts are ignored
+            cells (list, optional): (cell_x, cell_y) cell indices, in the same system as lowerLeftCellX
+                and lowerLeftCellY, see :meth:`GriddedData.cells_in_polygon`
+            mask (numpy.ndarray, optional): boolean array with the (numberOfCellsY, numberOfCellsX) shape
+                of the grids, rows from the lower (south) edge; selects its True cells
+            startdatetime (datetime, optional): keep grids starting at or after this time
+            enddatetime (datetime, optional): keep grids ending at or before this time
+            pathnames (list, optional): one dss pathname per cell; each cell is also stored as a
+                RegularTimeSeries, with values at the grid end times (E part); times without a grid
+                are stored as undefined
+
+        Raises:
+            ValueError: if neither or both of cells and mask are given, a cell is outside the grids,
+                the grids do not all have the same dimensions, pathnames does not match the cells,
+                or the grid end times are not at the interval of a pathname's E part.
+
+        Returns:
+            tuple: (times, values, cells), the datetime64[s] start time (D part) of each grid,
+            a float32 array with shape (time, n_cells), and the (n_cells, 2) cell indices.
+        """
+        if (cells is None) == (mask is None):
+            raise ValueError("give either cells or mask")
+        if cells is not None:
+            cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        grids = self._find_grids(pattern, startdatetime, enddatetime)
+        times = np.array([g[0] for g in grids], dtype="datetime64[s]")
+        if not grids:
+            if cells is None:
+                cells = np.empty((0, 2), dtype=np.int64)
+            return times, np.empty((0, len(cells)), dtype=np.float32), cells
+
+        first = self.get_grid(grids[0][2], with_location=False)
+        if first is None:
+            raise ValueError(f"unable to read grid '{grids[0][2]}'")
+        shape = first.data.shape
+        lower_left = (first.lowerLeftCellX, first.lowerLeftCellY)
+        if mask is not None:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != shape:
+                raise ValueError(f"mask has shape {mask.shape}, expected {shape}")
+            rows, cols = np.nonzero(mask)
+            cells = np.column_stack((cols + lower_left[0], rows + lower_left[1]))
+        cols = cells[:, 0] - lower_left[0]
+        rows = cells[:, 1] - lower_left[1]
+        if np.any((cols < 0) | (cols >= shape[1]) | (rows < 0) | (rows >= shape[0])):
+            raise ValueError(f"cells outside grid '{grids[0][2]}'")
+        if pathnames is not None and len(pathnames) != len(cells):
+            raise ValueError(f"{len(pathnames)} pathnames given for {len(cells)} cells")
+
+        index = rows * shape[1] + cols
+        buffer = first.data.reshape(-1)
+        values = np.empty((len(grids), len(index)), dtype=np.float32)
+        np.take(buffer, index, out=values[0])
+        for i in range(1, len(grids)):
+            gd = self.get_grid(grids[i][2], out=buffer, with_location=False)
+            if gd is None:
+                raise ValueError(f"unable to read grid '{grids[i][2]}'")
+            if gd.data.shape != shape or (gd.lowerLeftCellX, gd.lowerLeftCellY) != lower_left:
+                raise ValueError(f"grid '{grids[i][2]}' does not line up with '{grids[0][2]}'")
+            np.take(buffer, index, out=values[i])
+
+        if pathnames is not None:
+            ts_times = np.array([g[1] or g[0] for g in grids], dtype="datetime64[s]")
+            data_type = _GRID_DATA_TYPES[first.data_type] if first.data_type < len(_GRID_DATA_TYPES) else ""
+            # missing grids leave gaps, so place the values on the full axis of each interval
+            axes = [_regular_axis(ts_times, DssPath(str(pathname)).E) for pathname in pathnames]
+            for k, pathname in enumerate(pathnames):
+                positions, axis = axes[k]
+                column = np.full(len(axis), DSS_UNDEFINED_VALUE)
+                column[positions] = values[:, k]
+                column[np.isnan(column)] = DSS_UNDEFINED_VALUE
+                rts = RegularTimeSeries.create(values=column, times=axis, units=first.dataUnits,
+                                               data_type=data_type, path=pathname)
+                self.put(rts)
+
+        return times, values, cells
+
+    def _find_grids(self, pattern, startdatetime=None, enddatetime=None):
+        """returns (start, end, pathname) of each grid in the series of pattern, sorted by start time"""
+        path = DssPath(str(pattern))
+        pathFilter = f"/{path.A}/{path.B}/{path.C}/*/*/{path.F}/"
+        grids = []
+        for p in self.iter_catalog(pathFilter):
+            if p.recType != RecordType.Grid:
+                continue
+            parts = p.path.split("/")
+            try:
+                start = DateConverter.datetime_from_grid_date(parts[4])
+                end = DateConverter.datetime_from_grid_date(parts[5]) if parts[5] else None
+            except ValueError:
+                continue
+            if startdatetime and start < startdatetime:
+                continue
+            if enddatetime and (end or start) > enddatetime:
+                continue
+            grids.append((start, end, p.path))
+        grids.sort(key=lambda g: g[0])
+        return grids
+
+    def _grid_series_key(self, pathname):
+        path = DssPath(pathname)
+        return "/".join([path.A, path.B, path.C, path.F]).lower()
+
+    @staticmethod
+    def _grid_buffer(out, cells):
+        if out is None:
+            return np.empty(cells, dtype=np.float32)
+        if out.dtype != np.float32 or not out.flags["C_CONTIGUOUS"]:
+            raise ValueError(f"out must be a C-contiguous float32 array, got {out.dtype}")
+        if out.size < cells:
+            raise ValueError(f"out has {out.size} elements, the grid has {cells} cells")
+        return out.reshape(-1)
+
+    def _get_gridded_data(self, pathname, with_location=True, out=None):
+        key = self._grid_series_key(pathname)
+        header = self._grid_headers.get(key)
+        cached = header is not None
+        if header is None:
+            # first grid of this series: read the header only
+            header = self._read_grid_header(pathname, key)
+            if header is None:
+                print(f"Error reading gridded-data from '{pathname}'")
+                return None
+
+        numberOfCellsX, numberOfCellsY, numberOfRanges = header
+        buffer = self._grid_buffer(out, numberOfCellsX * numberOfCellsY)
+        status, gd = self._grid_retrieve(pathname, buffer, numberOfCellsX * numberOfCellsY, numberOfRanges)
+        if cached and (status != 0 or (gd.numberOfCellsX, gd.numberOfCellsY) != (numberOfCellsX, numberOfCellsY)
+                       or gd.numberOfRanges > numberOfRanges):
+            # this grid does not match the cached header of its series; read again with its own sizes
+            header = self._read_grid_header(pathname, key)
+            if header is None:
+                print(f"Error reading gridded-data from '{pathname}'")
+                return None
+            numberOfCellsX, numberOfCellsY, numberOfRanges = header
+            buffer = self._grid_buffer(out, numberOfCellsX * numberOfCellsY)
+            status, gd = self._grid_retrieve(pathname, buffer, numberOfCellsX * numberOfCellsY, numberOfRanges)
+
+        if status != 0:
+            print(f"Error reading gridded-data from '{pathname}'")
+            return None
+
+        gd.data = buffer[:numberOfCellsX * numberOfCellsY].reshape((numberOfCellsY, numberOfCellsX))
+        gd.id = pathname
+        gd.location_info = self._get_location_info(pathname) if with_location else None
+
+        return gd
+
+    def _read_grid_header(self, pathname, key):
+        """reads the sizes of one grid without its cells and caches them for its series, or returns None"""
+        status, gd = self._grid_retrieve(pathname, np.empty(0, dtype=np.float32))
+        if status != 0:
+            return None
+        header = (gd.numberOfCellsX, gd.numberOfCellsY, gd.numberOfRanges)
+        self._grid_headers[key] = header
+        return header
+
+    def _grid_retrieve(self, pathname, dataArray, dataLength=0, rangeTablesLength=0):
+        """
+        calls hec_dss_gridRetrieve, writing the cells into dataArray.
+        returns (status, GriddedData) where the GriddedData has every field except data.
+        """
         gridType = [0]
         dataType = [0]
         lowerLeftCellX = [0]
@@ -236,53 +871,48 @@ class HecDss:
             rangeLimitTable=rangeLimitTable,
             numberEqualOrExceedingRangeLimit=numberEqualOrExceedingRangeLimit,
             data=data,
-            # dataLength=0,
+            dataLength=dataLength,
+            rangeTablesLength=rangeTablesLength,
+            dataArray=dataArray,
             # dataUnitsLength=40,
             # dataSourceLength=40,
             # srsNameLength=40,
             # srsDefinitionLength=40,
             # timeZoneIDLength=40,
-            # rangeTablesLength=40,
         )
 
-        if status != 0:
-            print(f"Error reading gridded-data from '{pathname}'")
-            return None
-
-        gd = GriddedData()
-        gd.type = gridType[0]
-        gd.data_type = dataType[0]
-        gd.lowerLeftCellX = lowerLeftCellX[0]
-        gd.lowerLeftCellY = lowerLeftCellY[0]
-        gd.numberOfCellsX = numberOfCellsX[0]
-        gd.numberOfCellsY = numberOfCellsY[0]
-        gd.numberOfRanges = numberOfRanges[0]
-        gd.srsDefinitionType = srsDefinitionType[0]
-        gd.timeZoneRawOffset = timeZoneRawOffset[0]
-        gd.isInterval = isInterval[0]
-        gd.isTimeStamped = isTimeStamped[0]
-        gd.dataUnits = dataUnits[0]
-        gd.dataSource = dataSource[0]
-        gd.srsName = srsName[0]
-        gd.srsDefinition = srsDefinition[0]
-        gd.timeZoneID = timeZoneID[0]
-        gd.cellSize = cellSize[0]
-        gd.xCoordOfGridCellZero = xCoordOfGridCellZero[0]
-        gd.yCoordOfGridCellZero = yCoordOfGridCellZero[0]
-        gd.nullValue = nullValue[0]
-        gd.maxDataValue = maxDataValue[0]
-        gd.minDataValue = minDataValue[0]
-        gd.meanDataValue = meanDataValue[0]
-        gd.rangeLimitTable = rangeLimitTable
-        gd.numberEqualOrExceedingRangeLimit = numberEqualOrExceedingRangeLimit
-        # gd.data = [[data[(i*numberOfCellsX[0])+j] for j in range(numberOfCellsX[0])] for i in range(numberOfCellsY[0])]
-        gd.data = np.array(data).reshape((numberOfCellsY[0], numberOfCellsX[0]))
-        gd.id = pathname
-        gd.location_info = self._get_location_info(pathname)
-
-        return gd
-
-    def _get_paired_data(self, pathname):
+        gd = None
+        if status == 0:
+            gd = GriddedData()
+            gd.type = gridType[0]
+            gd.data_type = dataType[0]
+            gd.lowerLeftCellX = lowerLeftCellX[0]
+            gd.lowerLeftCellY = lowerLeftCellY[0]
+            gd.numberOfCellsX = numberOfCellsX[0]
+            gd.numberOfCellsY = numberOfCellsY[0]
+            gd.numberOfRanges = numberOfRanges[0]
+            gd.srsDefinitionType = srsDefinitionType[0]
+            gd.timeZoneRawOffset = timeZoneRawOffset[0]
+            gd.isInterval = isInterval[0]
+            gd.isTimeStamped = isTimeStamped[0]
+            gd.dataUnits = dataUnits[0]
+            gd.dataSource = dataSource[0]
+            gd.srsName = srsName[0]
+            gd.srsDefinition = srsDefinition[0]
+            gd.timeZoneID = timeZoneID[0]
+            gd.cellSize = cellSize[0]
+            gd.xCoordOfGridCellZero = xCoordOfGridCellZero[0]
+            gd.yCoordOfGridCellZero = yCoordOfGridCellZero[0]
+            gd.nullValue = nullValue[0]
+            gd.maxDataValue = maxDataValue[0]
+            gd.minDataValue = minDataValue[0]
+            gd.meanDataValue = meanDataValue[0]
+            gd.rangeLimitTable = rangeLimitTable
+            gd.numberEqualOrExceedingRangeLimit = numberEqualOrExceedingRangeLimit
+
+        return status, gd
+
+    def _get_paired_data(self, pathname, with_location=True):
         numberOrdinates = [0]
         numberCurves = [0]
         unitsIndependent = [""]
@@ -304,8 +934,10 @@ class HecDss:
         # print("Number of Curves:", numberCurves[0])
         # print("length of labels:", labelsLength[0])
 
-        doubleOrdinates = []
-        doubleValues = []
+        nOrd = numberOrdinates[0]
+        nCurves = numberCurves[0]
+        doubleOrdinates = np.empty(nOrd, dtype=np.float64)
+        doubleValues = np.empty(nCurves * nOrd, dtype=np.float64)
         labels = []
         # suffix of '2' so w don't info from calling hec_dss_pdRetrieveInfo
         numberOrdinates2 = [0]
@@ -317,8 +949,8 @@ class HecDss:
         timeZoneName = [""]
         timeZoneNameLength = [""]
         status = self._native.hec_dss_pdRetrieve(pathname,
-                                                 doubleOrdinates, numberOrdinates[0],
-                                                 doubleValues, numberCurves[0] * numberOrdinates[0],
+                                                 doubleOrdinates, nOrd,
+                                                 doubleValues, nCurves * nOrd,
                                                  numberOrdinates2, numberCurves2,
                                                  unitsIndependent2, len(unitsIndependent[0]) + 1,
                                                  typeIndependent2, len(typeIndependent[0]) + 1,
@@ -332,18 +964,11 @@ class HecDss:
             return None
 
         pd = PairedData()
-        pd.ordinates = np.array(doubleOrdinates)
+        pd.ordinates = doubleOrdinates
 
         n = numberCurves2[0].value
-        ordinateCount = len(doubleOrdinates)
-        if n > 1:
-            # ---------------------------------------------------------------------------------------- #
-            # rearrange from consecutive values for each curve to consecutive curves for each ordinate #
-            # ---------------------------------------------------------------------------------------- #
-            groups = [doubleValues[i*ordinateCount:(i+1)*ordinateCount] for i in range(n)]
-            doubleValues = list(map(list, zip(*groups)))
-        pd.values = np.array(doubleValues).reshape((len(doubleOrdinates), n))
-        # pd.values = [doubleValues[i:i+n] for i in range(0, len(doubleValues), n)]
+        # values are consecutive for each curve; the transpose is a view with one column per curve
+        pd.values = doubleValues.reshape((n, nOrd)).T
         pd.labels = labels
         pd.type_independent = typeIndependent2[0]
         pd.type_dependent = typeDependent2[0]
@@ -351,7 +976,7 @@ class HecDss:
         pd.units_dependent = unitsDependent2[0]
         pd.time_zone_name = timeZoneName[0]
         pd.id = pathname
-        pd.location_info = self._get_location_info(pathname)
+        pd.location_info = self._get_location_info(pathname) if with_location else None
 
         return pd
 
@@ -381,9 +1006,14 @@ class HecDss:
         return (first, last)
 
 
-    def _get_timeseries(self, pathname, startDateTime, endDateTime, trim):
+    def _get_timeseries(self, pathname, startDateTime, endDateTime, trim, record_type=None,
+                        with_location=True, scratch=None):
+        # scratch (dict) holds retrieve buffers that are reused between calls, see get_many
+        if record_type is None:
+            record_type = self.get_record_type(pathname)
         # get sizes
-        firstValidJulian, firstSeconds, lastValidJulian, lastSeconds = self._get_julian_time_range(pathname, 1)
+        if startDateTime is None or endDateTime is None:
+            firstValidJulian, firstSeconds, lastValidJulian, lastSeconds = self._get_julian_time_range(pathname, 1)
         if startDateTime is None:
             _startDateTime = DateConverter.date_time_from_julian_second(firstValidJulian[0], firstSeconds[0])
             firstSeconds, firstJulian = firstSeconds, firstValidJulian
@@ -419,7 +1049,7 @@ class HecDss:
         # print("Quality element size:", qualityElementSize[0])
 
         number_periods = numberValues[0]
-        if RecordType.RegularTimeSeries == self.get_record_type(pathname):
+        if RecordType.RegularTimeSeries == record_type:
             dsspath = DssPath(pathname)
             interval_seconds = DateConverter.intervalString_to_sec(dsspath.E)
 
@@ -432,11 +1062,23 @@ class HecDss:
             )
 
         # tsRetrive
-
-        times = [0]
-        values = []
+        # the library writes straight into these arrays; no Python list round-trip
+        arraySize = number_periods + 1
+        qualitySize = arraySize * qualityElementSize[0]
+        if scratch is None:
+            times = np.empty(arraySize, dtype=np.int32)
+            values = np.empty(arraySize, dtype=np.float64)
+            quality = np.empty(qualitySize, dtype=np.int32)
+        else:
+            if scratch.get("values") is None or len(scratch["values"]) < arraySize:
+                scratch["times"] = np.empty(arraySize, dtype=np.int32)
+                scratch["values"] = np.empty(arraySize, dtype=np.float64)
+            if scratch.get("quality") is None or len(scratch["quality"]) < qualitySize:
+                scratch["quality"] = np.empty(qualitySize, dtype=np.int32)
+            times = scratch["times"][:arraySize]
+            values = scratch["values"][:arraySize]
+            quality = scratch["quality"][:qualitySize]
         numberValuesRead = [0]
-        quality = []
         julianBaseDate = [0]
         timeGranularitySeconds = [0]
         units = [""]
@@ -444,7 +1086,7 @@ class HecDss:
         dataType = [""]
         timeZoneName = [""]
 
-        status = self._native.hec_dss_tsRetrieve(
+        status = self._native.hec_dss_tsRetrieve_arrays(
             pathname,
             startDate,
             startTime,
@@ -452,7 +1094,6 @@ class HecDss:
             endTime,
             times,
             values,
-            number_periods+1,
             numberValuesRead,
             quality,
             qualityElementSize[0],
@@ -465,6 +1106,13 @@ class HecDss:
             timeZoneName,
             bufferLength
         )
+        times = times[:numberValuesRead[0]]
+        values = values[:numberValuesRead[0]]
+        quality = quality[:numberValuesRead[0]]
+        if scratch is not None:
+            # the scratch buffers are overwritten by the next read, so keep copies
+            values = values.copy()
+            quality = quality.copy()
 
         # print("units = "+units[0])
         # print("datatype = "+dataType[0])
@@ -473,43 +1121,44 @@ class HecDss:
         # print(values)
         # print("julianBaseDate = " + str(julianBaseDate[0]))
         # print("timeGranularitySeconds = " + str(timeGranularitySeconds[0]))
-        if RecordType.IrregularTimeSeries == self.get_record_type(pathname):
+        if RecordType.IrregularTimeSeries == record_type:
             ts = IrregularTimeSeries()
+            # drop undefined values
+            keep = values != DSS_UNDEFINED_VALUE
+            if not keep.all():
+                times = times[keep]
+                values = values[keep]
+                if len(quality):
+                    quality = quality[keep]
         else:
             ts = RegularTimeSeries()
             if trim or not startDateTime or not endDateTime:
-                trimmed_indices = [i for i, v in enumerate(values) if values[i] != DSS_UNDEFINED_VALUE]
-                if not trimmed_indices:
-                    times = []
-                    values = []
-                    quality = []
+                defined = values != DSS_UNDEFINED_VALUE
+                if not defined.any():
+                    times = times[:0]
+                    values = values[:0]
+                    quality = quality[:0]
                 else:
-                    start = 0 if startDateTime and not trim else trimmed_indices[0]
-                    end = len(times) if endDateTime and not trim else trimmed_indices[-1]+1
+                    # first and last defined values, without building an index list
+                    start = 0 if startDateTime and not trim else int(defined.argmax())
+                    end = len(times) if endDateTime and not trim else len(defined) - int(defined[::-1].argmax())
                     times = times[start:end]
                     values = values[start:end]
-                    if quality != []:
+                    if len(quality):
                         quality = quality[start:end]
-        new_times = DateConverter.date_times_from_julian_array(
+        # datetime64 times; datetime objects are only built if ts.times is accessed
+        new_times = DateConverter.datetime64_from_julian_array(
             times, timeGranularitySeconds[0], julianBaseDate[0]
         )
-        arr = np.array(values)
-        if RecordType.IrregularTimeSeries == type(ts):
-            indices = np.where(np.isclose(values, DSS_UNDEFINED_VALUE, rtol=0, atol=0, equal_nan=True))[0]
-            arr = np.delete(arr, indices)
-            new_times = [new_times[i] for i in range(len(new_times)) if not np.isin(i, indices)]
-            quality = [quality[i] for i in range(len(quality)) if not np.isin(i, indices)]
-
-        values = arr
         units = units[0]
         data_type = dataType[0]
-        start_date = [] if len(new_times) == 0 else new_times[0]
+        start_date = [] if len(new_times) == 0 else new_times[0].item()
         time_granularity_seconds = timeGranularitySeconds[0]
         julian_base_date = julianBaseDate[0]
         timeZoneName = timeZoneName[0]
         if(timeZoneName):
             try:
-                new_times = [i.replace(tzinfo=ZoneInfo(timeZoneName)) for i in new_times]
+                ZoneInfo(timeZoneName)  # applied when the times are materialized
             except ZoneInfoNotFoundError as e: 
                 print(f"Warning: {e}. Using no zone instead.")
                 timeZoneName = False
@@ -517,7 +1166,7 @@ class HecDss:
             new_times = []
             start_date = _startDateTime - timedelta(seconds=interval_seconds)
 
-        location_info = self._get_location_info(pathname)
+        location_info = self._get_location_info(pathname) if with_location else None
         ts = ts.create(values=values, times=new_times, quality=quality, units=units, data_type=data_type, start_date=start_date, time_granularity_seconds=time_granularity_seconds, julian_base_date=julian_base_date, time_zone_name=timeZoneName, path=pathname, location_info=location_info)
 
         if (DssPath(pathname).D.lower() == "ts-pattern"):
@@ -527,6 +1176,30 @@ class HecDss:
         return ts
 
     def _get_location_info(self, pathname: str):
+        """
+        gets the LocationInfo for pathname, using the per-file cache keyed by the A/B/C location path.
+        Returns a copy with id set to pathname, or None when there is no location record.
+        """
+        key = str(DssPath(pathname).path_location_info()).lower()
+        if key in self._location_cache:
+            self._location_cache.move_to_end(key)
+            location_info = self._location_cache[key]
+        else:
+            location_info = self._read_location_info(pathname)
+            self._location_cache[key] = location_info
+            if len(self._location_cache) > LOCATION_CACHE_SIZE:
+                self._location_cache.popitem(last=False)
+        if location_info is None:
+            return None
+        location_info = copy.deepcopy(location_info)
+        location_info.id = pathname
+        return location_info
+
+    def _invalidate_location_info(self, pathname: str):
+        key = str(DssPath(pathname).path_location_info()).lower()
+        self._location_cache.pop(key, None)
+
+    def _read_location_info(self, pathname: str):
         x = [0.0]
         y = [0.0]
         z = [0.0]
@@ -580,11 +1253,12 @@ class HecDss:
 
         return location_info
 
-    def put(self, container) -> int:
+    def put(self, container, save_as_float=False) -> int:
         """puts data into the DSS file
 
         Args:
             container (varies): RegularTimeSeries, IrregularTimeSeries, PairedData, GriddedData, ArrayContainer
+            save_as_float (bool): store time-series values as 4 byte floats instead of doubles. Defaults to False.
 
         Raises:
             NotImplementedError: if saving the type of container is not supported.
@@ -598,10 +1272,10 @@ class HecDss:
             ts = container
             # def hec_dss_tsStoreRegular(dss, pathname, startDate, startTime, valueArray, qualityArray,
             #                           saveAsFloat, units, type):
-            if not len(ts.times):
+            if not ts.get_length():
                 raise Exception("Time Series has an empty times array")
 
-            startDate, startTime = DateConverter.dss_datetime_strings_from_datetime(ts.times[0])
+            startDate, startTime = DateConverter.dss_datetime_strings_from_datetime(ts._get_first_time())
             quality = container.quality
 
             status = self._native.hec_dss_tsStoreRegular(
@@ -610,13 +1284,13 @@ class HecDss:
                 startTime,
                 ts.values,
                 quality,
-                False,
+                save_as_float,
                 ts.units,
                 ts.data_type,
                 ts.time_zone_name,
                 0
             )
-            self._catalog = None
+            self._notify_catalog_put(ts.id, RecordType.RegularTimeSeries, status, ts)
         elif type(container) is IrregularTimeSeries:
             its = container
             if (DssPath(its.id).D.lower() == "ts-pattern"):
@@ -626,8 +1300,8 @@ class HecDss:
             start_date_base = (datetime(1900, 1, 1)+timedelta(days=its.julian_base_date))
             startDate, startTime = DateConverter.dss_datetime_strings_from_datetime(start_date_base)
             quality = container.quality
-            julian_times = DateConverter.julian_array_from_date_times(its.times, its.time_granularity_seconds, start_date_base)
-            if max(julian_times) >= 2147483647:
+            julian_times = DateConverter.julian_array_from_datetime64(its.times64, its.time_granularity_seconds, start_date_base)
+            if len(julian_times) and julian_times.max() >= 2147483647:
                 raise Exception("Julian times contains value larger than 2147483647, increase granularity or change "
                                 "start_date_base to fix.")
             status = self._native.hec_dss_tsStoreIrregular(
@@ -637,52 +1311,135 @@ class HecDss:
                 its.time_granularity_seconds,
                 its.values,
                 quality,
-                False,
+                save_as_float,
                 its.units,
                 its.data_type,
                 its.time_zone_name,
                 1
             )
-            self._catalog = None
+            self._notify_catalog_put(its.id, RecordType.IrregularTimeSeries, status, its)
         elif type(container) is PairedData:
             pd = container
             # print(pd)
             status = self._native.hec_dss_pdStore(pd)
-            self._catalog = None
+            self._notify_catalog_put(pd.id, RecordType.PairedData, status)
         elif type(container) is GriddedData:
             gd = container
             status = self._native.hec_dss_gridStore(gd)
-            self._catalog = None
+            self._notify_catalog_put(gd.id, RecordType.Grid, status)
         elif type(container) is ArrayContainer:
             status = self._native.hec_dss_arrayStore(container.id, container.int_values, container.float_values, container.double_values)
-            self._catalog = None
+            self._notify_catalog_put(container.id, RecordType.Array, status)
         elif type(container) is LocationInfo:
             status = self._native.hec_dss_locationStore(container,1)
-            self._catalog = None
+            self._invalidate_location_info(container.id)
+            self._notify_catalog_put(container.id, RecordType.LocationInfo, status)
         elif type(container) is Text:
             text = container
             status = self._native.hec_dss_textStore(text.id, text.text, len(text.text))
-            self._catalog = None
+            self._text_sizes[text.id.lower()] = len(text.text.encode("utf-8")) + 1
+            self._notify_catalog_put(text.id, RecordType.Text, status)
         else:
             raise NotImplementedError(f"unsupported record_type: {type(container)}. Expected types are: {RecordType.SUPPORTED_RECORD_TYPES.value}")
 
         if hasattr(container, "location_info") and container.location_info is not None:
-            status = self._native.hec_dss_locationStore(container.location_info,1)
+            status = self._put_location_info(container)
 
-        # TODO -- instead of invalidating catalog,with _catalog=None
-        #  can we be smart?
-        # TODO -- if we get smart, catalog has  recordTypeDict and timeSeriesDictNoDates
-        # how about Catalog has method  catalog.notify_put(pathname,RecordType)
-        #  and                          catalog.notify_delete(pathname, RecordType)
-        # if not self._catalog is None:
-        #     self._catalog.recordTypeDict[pd.id] = RecordType.PairedData
+        return status
 
+    def _put_location_info(self, container):
+        """stores the location info of container, returns the status of the store"""
+        status = self._native.hec_dss_locationStore(container.location_info,1)
+        self._invalidate_location_info(container.location_info.id)
+        self._notify_catalog_put(container.id, RecordType.LocationInfo, status)
         return status
 
+    def _notify_catalog_put(self, pathname, record_type, status, container=None):
+        """updates the cached catalog after a write, instead of discarding it
+
+        Args:
+            pathname (str): dss pathname that was written
+            record_type (RecordType): record type that was written
+            status (int): status returned by the native store
+            container (RegularTimeSeries or IrregularTimeSeries, optional): time-series that was written,
+                its times give the blocks to add.
+        """
+        self._forget_record_type(pathname)
+        if self._catalog is None:
+            return
+        if status != 0:
+            self._catalog = None
+            return
+        if record_type not in (RecordType.RegularTimeSeries, RecordType.IrregularTimeSeries):
+            self._catalog.notify_put(pathname, record_type)
+            return
+        blocks = self._written_blocks(DssPath(pathname), record_type, container)
+        if blocks is None:
+            self._catalog = None
+            return
+        for blockPath in blocks:
+            self._catalog.notify_put(blockPath, record_type)
+
+    @staticmethod
+    def _written_blocks(path, record_type, container):
+        """block pathnames a time-series write went to, or None when they cannot be worked out"""
+        if container is None or path.D.lower() == "ts-pattern":
+            return None
+        times = container.times64
+        if record_type == RecordType.RegularTimeSeries:
+            block = _regular_block(DateConverter.intervalString_to_sec(path.E))
+            values = np.asarray(container.values, dtype=np.float64)
+            if block is None or times is None or len(times) != len(values):
+                return None
+            # blocks that are all missing are not written
+            times = times[(values != DSS_UNDEFINED_VALUE) & ~np.isnan(values)]
+        else:
+            block = _IRREGULAR_BLOCKS.get(path.E.lower())
+            if block is None or times is None:
+                return None
+        return [f"/{path.A}/{path.B}/{path.C}/{d}/{path.E}/{path.F}/" for d in _block_d_parts(times, block)]
+
+    def put_grids(self, grids, max_workers=None, processes=False, max_pending=None, update_info=True):
+        """compresses grids on a pool of workers and stores them from this thread, in order
+
+        Compression (and the grid statistics) run in parallel; the DSS writes, including the
+        location info of each grid, stay on the calling thread, which is the only one using this file handle.
+
+        Args:
+            grids (iterable): GriddedData to store; read lazily, so it can be a generator.
+            max_workers (int, optional): number of workers. Defaults to None (one per CPU).
+            processes (bool): compress in a process pool instead of a thread pool. Defaults to False.
+            max_pending (int, optional): most grids compressed or waiting to be stored at one time.
+                Defaults to twice the number of workers.
+            update_info (bool): call update_grid_info on each grid in the workers, before compressing.
+                Defaults to True. The grids passed in are not modified.
+
+        Returns:
+            list: status of each store, in the order of grids (0 if successful).
+        """
+        pool_type = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_pending is None:
+            max_pending = 2 * max_workers
+        statuses = []
+        with pool_type(max_workers=max_workers) as pool:
+            pending = deque()
+
+            def store_oldest():
+                gd, compressed = pending.popleft().result()
+                statuses.append(self.writePrecompressedGrid(gd, compressed, len(compressed)))
+
+            for gd in grids:
+                pending.append(pool.submit(_compress_grid, gd, update_info))
+                while len(pending) >= max(1, max_pending):
+                    store_oldest()
+            while pending:
+                store_oldest()
+        return statuses
 
     def writePrecompressedGrid(self, gd, compressedData, CompressionSize):
         """
-        puts pre-compressed gridded data into the DSS file
+        puts pre-compressed gridded data into the DSS file, and its location info as put does
 
         Args
             compressedData (bytes): Compressed data.
@@ -693,7 +1450,9 @@ class HecDss:
 
         if compressedData and CompressionSize > 0:
             status = self._native.hec_dss_gridStore(gd, compressedData, CompressionSize)
-            self._catalog = None
+            self._notify_catalog_put(gd.id, RecordType.Grid, status)
+            if gd.location_info is not None:
+                status = self._put_location_info(gd)
             return status
         return -1
 
@@ -710,12 +1469,13 @@ class HecDss:
         rt = self.get_record_type(pathname)
         delete_path = DssPath(pathname)
         if (rt == RecordType.RegularTimeSeries or rt == RecordType.IrregularTimeSeries) and allrecords:
-            for i in self.get_catalog().uncondensed_paths:
+            pathFilter = f"/{delete_path.A}/{delete_path.B}/{delete_path.C}/*/{delete_path.E}/{delete_path.F}/"
+            for i in self.get_catalog(pathFilter).uncondensed_paths:
                 uncondensed_path = DssPath(i)
                 if uncondensed_path.path_without_date().__eq__(delete_path.path_without_date()):
                     status = self._native.hec_dss_delete(i)
-                    if status == 0:
-                        self._catalog = None
+                    if status == 0 and self._catalog is not None:
+                        self._catalog.notify_delete(i)
         elif rt == RecordType.RegularTimeSeries and (startdatetime or enddatetime):
             newStartDateTime, newEndDateTime = self._get_date_time_range(pathname, 1)
             if startdatetime:
@@ -777,19 +1537,75 @@ class HecDss:
         else:
             status = self._native.hec_dss_delete(pathname)
             if status == 0:
-                self._catalog = None
+                if self._catalog is not None:
+                    self._catalog.notify_delete(pathname)
             else:
                 print(f"Error deleting record from '{pathname}', Record does not exist or timeseries path must be uncondensed")
+        self._forget_record_type(pathname)
+        self._invalidate_location_info(pathname)
         return status
 
-    def get_catalog(self) -> Catalog:
+    def get_catalog(self, pattern: str = None, cache=None) -> Catalog:
         """gets the DSS Catalog of all items in the DSS file
 
+        Args:
+            pattern (str, optional): pathname filter applied by the DSS library, with '*' wildcards,
+                for example "/*/COYOTE/*/*/*/*/". Defaults to None (all records).
+            cache (bool or str, optional): keep the full catalog in a cache file, reused while the size,
+                modification time and record count of the DSS file are unchanged. True puts the cache
+                file next to the DSS file, a str names a cache directory. Ignored with a pattern.
+                Defaults to None (no cache).
+
+        The full catalog (no pattern) is kept by this HecDss and updated by later puts and deletes,
+        which then also use it to look up record types.
+
         Returns:
             Catalog: :class:`Catalog`
         """
-        paths, recordTypes = self._native.hec_dss_catalog()
-        return Catalog(paths, recordTypes)
+        if pattern:
+            return Catalog.from_records(self._native.hec_dss_catalog_iter(pattern))
+        catalog = None
+        if cache:
+            cacheFile = self._catalog_cache_file(cache)
+            st = os.stat(self._filename)
+            stamp = (st.st_size, st.st_mtime_ns, self.record_count())
+            catalog = Catalog.load(cacheFile, stamp)
+            if catalog is None:
+                catalog = Catalog.from_records(self._native.hec_dss_catalog_iter())
+                try:
+                    catalog.save(cacheFile, stamp)
+                except OSError as e:
+                    print(f"Unable to write catalog cache '{cacheFile}': {e}")
+        if catalog is None:
+            catalog = Catalog.from_records(self._native.hec_dss_catalog_iter())
+        self._catalog = catalog
+        return catalog
+
+    def _catalog_cache_file(self, cache):
+        path = os.path.abspath(self._filename)
+        if cache is True:
+            return path + ".catalog.npz"
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(cache, f"{os.path.basename(path)}-{digest}.catalog.npz")
+
+    def iter_catalog(self, pattern: str = None):
+        """iterates over the uncondensed pathnames in the DSS file, without building a Catalog
+
+        Each pathname is decoded from the native catalog buffer only when it is reached.
+
+        Args:
+            pattern (str, optional): pathname filter applied by the DSS library, with '*' wildcards,
+                for example "/*/COYOTE/*/*/*/*/". Defaults to None (all records).
+
+        Yields:
+            CatalogRecord: (path, recType) tuple, where recType is the :class:`RecordType` of the record
+        """
+        recordTypes = {}
+        for path, recordType in self._native.hec_dss_catalog_iter(pattern or ""):
+            rt = recordTypes.get(recordType)
+            if rt is None:
+                rt = recordTypes[recordType] = RecordType.RecordTypeFromInt(recordType)
+            yield CatalogRecord(path, rt)
 
     def record_count(self) -> int:
         """get the number of records stored in the dss file
@@ -1,7 +1,10 @@
 from datetime import datetime
+from zoneinfo import ZoneInfo
 
 import numpy as np
 
+from .dateconverter import DateConverter
+
 
 class IrregularTimeSeries:
     """ container for time-series data that is not at a consistent interval.
@@ -12,7 +15,8 @@ class IrregularTimeSeries:
         Initialize an IrregularTimeSeries object with default values.
         """
 
-        self.times = []
+        self._times = []
+        self._times64 = None
         self.values = np.empty(0)
         self.quality = []
         self.units = ""
@@ -25,6 +29,46 @@ class IrregularTimeSeries:
         self.id = ""
         self.location_info = None
 
+    @property
+    def times(self):
+        """
+        list of datetime for each value.
+
+        When the series was read with datetime64 times the list is built
+        on first access (with the time zone applied) and kept from then on.
+        """
+        if self._times is None:
+            tz = ZoneInfo(self.time_zone_name) if self.time_zone_name else None
+            self._times = DateConverter.date_times_from_datetime64(self._times64, tz)
+            self._times64 = None
+        return self._times
+
+    @times.setter
+    def times(self, value):
+        if isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.datetime64):
+            self._times = None
+            self._times64 = value.astype("datetime64[s]", copy=False)
+        else:
+            self._times = value
+            self._times64 = None
+
+    @property
+    def times64(self):
+        """
+        times as a numpy datetime64[s] array (wall clock time, no time zone)
+        """
+        if self._times is None:
+            return self._times64
+        return DateConverter.datetime64_from_date_times(self._times)
+
+    def _get_first_time(self):
+        """
+        Returns the first time as a datetime without building the full times list.
+        """
+        if self._times is None:
+            return self._times64[0].item()
+        return self._times[0]
+
     def add_data_point(self, date, value):
         """
         append a date,value to this time-series
@@ -74,7 +118,9 @@ class IrregularTimeSeries:
         Returns:
         int: The number of data points in the time-series.
         """
-        return len(self.times)
+        if self._times is None:
+            return len(self._times64)
+        return len(self._times)
 
     def print_to_console(self):
         """
@@ -98,7 +144,7 @@ class IrregularTimeSeries:
          """
         irts = IrregularTimeSeries()
         irts.times = times
-        irts.values = np.array(values)
+        irts.values = np.asarray(values)  # arrays are kept, not copied
         irts.quality = quality
         irts.units = units
         irts.data_type = data_type
@@ -107,7 +153,7 @@ class IrregularTimeSeries:
         irts.time_granularity_seconds = time_granularity_seconds
         irts.julian_base_date = 0
         if julian_base_date is None and len(times):
-            irts.julian_base_date = (times[0]-datetime(1900, 1, 1)).days
+            irts.julian_base_date = (irts._get_first_time().replace(tzinfo=None)-datetime(1900, 1, 1)).days
         irts.time_zone_name = time_zone_name
         irts.id = path
         irts.location_info = location_info
@@ -4,21 +4,321 @@ from ctypes import c_int32
 from ctypes import byref, create_string_buffer
 from ctypes.util import find_library
 import numpy as np
+from collections import Counter
 from importlib import resources
 import io
 import os
 import sys
+import threading
 from typing import List
 
 # from hecdss.location_info import LocationInfo
 
+# initial number of paths requested from a filtered hec_dss_catalog call
+_CATALOG_FILTER_CAPACITY = 256
+
+# ctypes prototypes (argtypes, restype) for the hecdss exports used by _Native.
+# These are bound a single time, when the shared library is first loaded.
+_PROTOTYPES = {
+    "hec_dss_open": ([c_char_p, POINTER(c_void_p)], c_int),
+    "hec_dss_close": ([c_void_p], c_int),
+    "hec_dss_record_count": ([c_void_p], c_int),
+    "hec_dss_set_value": ([c_char_p, c_int], c_int),
+    "hec_dss_export_to_file": ([
+        c_void_p,  # dss
+        c_char_p,  # path
+        c_char_p,  # outputFile
+        c_char_p,  # startDate
+        c_char_p,  # startTime
+        c_char_p,  # endDate
+        c_char_p,  # endTime
+    ], c_int),
+    "hec_dss_CONSTANT_MAX_PATH_SIZE": ([], c_int),
+    "hec_dss_catalog": ([
+        c_void_p,  # dss
+        c_char_p,  # pathBuffer
+        POINTER(c_int),  # recordTypes
+        c_char_p,  # pathFilter
+        c_int,  # count
+        c_int,  # pathBufferItemSize
+    ], c_int),
+    "hec_dss_gridRetrieve": ([
+        c_void_p, c_char_p, c_int,
+        POINTER(c_int), POINTER(c_int),  # gridType, dataType
+        POINTER(c_int), POINTER(c_int),  # lowerLeftCellX, lowerLeftCellY
+        POINTER(c_int), POINTER(c_int),  # numberOfCellsX, numberOfCellsY
+        POINTER(c_int), POINTER(c_int),  # numberOfRanges, srsDefinitionType
+        POINTER(c_int), POINTER(c_int),  # timeZoneRawOffset, isInterval
+        POINTER(c_int),  # isTimeStamped
+        c_char_p, c_int,  # dataUnits
+        c_char_p, c_int,  # dataSource
+        c_char_p, c_int,  # srsName
+        c_char_p, c_int,  # srsDefinition
+        c_char_p, c_int,  # timeZoneID
+        POINTER(c_float), POINTER(c_float),  # cellSize, xCoordOfGridCellZero
+        POINTER(c_float), POINTER(c_float),  # yCoordOfGridCellZero, nullValue
+        POINTER(c_float), POINTER(c_float),  # maxDataValue, minDataValue
+        POINTER(c_float),  # meanDataValue
+        POINTER(c_float), c_int,  # rangeLimitTable, rangeTablesLength
+        POINTER(c_int),  # numberEqualOrExceedingRangeLimit
+        POINTER(c_float), c_int,  # data, dataLength
+    ], c_int),
+    "hec_dss_gridStore": ([
+        c_void_p,  # dss
+        c_char_p,  # pathname
+        c_int,  # gridType
+        c_int,  # dataType
+        c_int,  # lowerLeftCellX
+        c_int,  # lowerLeftCellY
+        c_int,  # numberOfCellsX
+        c_int,  # numberOfCellsY
+        c_int,  # numberOfRanges
+        c_int,  # srsDefinitionType
+        c_int,  # timeZoneRawOffset
+        c_int,  # isInterval
+        c_int,  # isTimeStamped
+        c_int,  # compressionSize
+        c_char_p,  # dataUnits
+        c_char_p,  # dataSource
+        c_char_p,  # srsName
+        c_char_p,  # srsDefinition
+        c_char_p,  # timeZoneID
+        c_float,  # cellSize
+        c_float,  # xCoordOfGridCellZero
+        c_float,  # yCoordOfGridCellZero
+        c_float,  # nullValue
+        c_float,  # maxDataValue
+        c_float,  # minDataValue
+        c_float,  # meanDataValue
+        POINTER(c_float),  # rangeLimitTable
+        POINTER(c_int),  # numberEqualOrExceedingRangeLimit
+        POINTER(c_float),  # data
+    ], c_int),
+    "hec_dss_pdRetrieveInfo": ([
+        c_void_p, c_char_p,
+        POINTER(c_int), POINTER(c_int),  # numberOrdinates, numberCurves
+        c_char_p, c_int,  # unitsIndependent
+        c_char_p, c_int,  # unitsDependent
+        c_char_p, c_int,  # typeIndependent
+        c_char_p, c_int,  # typeDependent
+        POINTER(c_int),  # labelsLength
+    ], c_int),
+    "hec_dss_pdRetrieve": ([
+        c_void_p, c_char_p,
+        POINTER(c_double), c_int,  # doubleOrdinates
+        POINTER(c_double), c_int,  # doubleValues
+        POINTER(c_int), POINTER(c_int),  # numberOrdinates, numberCurves
+        c_char_p, c_int,  # unitsIndependent
+        c_char_p, c_int,  # typeIndependent
+        c_char_p, c_int,  # unitsDependent
+        c_char_p, c_int,  # typeDependent
+        c_char_p, c_int,  # labels
+        c_char_p, c_int,  # timeZoneName
+    ], c_int),
+    "hec_dss_pdStore": ([
+        c_void_p,  # dss (void*)
+        c_char_p,  # pathname (const char*)
+        POINTER(c_double),  # ordinatesArray (double*)
+        c_int,  # ordinatesLength (int)
+        POINTER(c_double),  # valuesArray (double*)
+        c_int,  # valuesLength (int)
+        c_int,  # numberOrdinates (int)
+        c_int,  # NumberCurves (int)
+        c_char_p,  # unitsIndependent (const char*)
+        c_char_p,  # typeIndependent (const char*)
+        c_char_p,  # unitsDependent (const char*)
+        c_char_p,  # typeDependent (const char*)
+        c_char_p,  # labels (const char*)
+        c_int,  # labelsLength (int)
+        c_char_p,  # timeZoneName (const char*)
+    ], c_int),
+    "hec_dss_tsGetSizes": ([
+        c_void_p,  # dss
+        c_char_p,  # path
+        c_char_p,  # startDate
+        c_char_p,  # startTime
+        c_char_p,  # endDate
+        c_char_p,  # endTime
+        POINTER(c_int),  # numberValues
+        POINTER(c_int),  # qualityElementSize
+    ], c_int),
+    "hec_dss_tsGetDateTimeRange": ([
+        c_void_p,  # dss
+        c_char_p,  # path
+        c_int,  # boolFullSet
+        POINTER(c_int),  # firstValidJulian
+        POINTER(c_int),  # firstSeconds
+        POINTER(c_int),  # lastValidJulian
+        POINTER(c_int),  # lastSeconds
+    ], c_int),
+    "hec_dss_numberPeriods": ([
+        c_int,  # intervalSeconds
+        c_int,  # julianStart
+        c_int,  # startSeconds
+        c_int,  # julianEnd
+        c_int,  # endSeconds
+    ], c_int),
+    "hec_dss_tsRetrieve": ([
+        c_void_p,  # dss
+        c_char_p,  # pathname
+        c_char_p,  # startDate
+        c_char_p,  # startTime
+        c_char_p,  # endDate
+        c_char_p,  # endTime
+        POINTER(c_int),  # timeArray
+        POINTER(c_double),  # valueArray
+        c_int,  # arraySize
+        POINTER(c_int),  # numberValuesRead
+        POINTER(c_int),  # quality
+        c_int,  # qualityLength
+        POINTER(c_int),  # julianBaseDate
+        POINTER(c_int),  # timeGranularitySeconds
+        c_char_p,  # units
+        c_int,  # unitsLength
+        c_char_p,  # dataType
+        c_int,  # typeLength
+        c_char_p,  # timeZoneName
+        c_int,  # timeZoneNameLength
+    ], c_int),
+    "hec_dss_tsStoreRegular": ([
+        c_void_p,  # dss (void*)
+        c_char_p,  # pathname (const char*)
+        c_char_p,  # startDate (const char*)
+        c_char_p,  # startTime (const char*)
+        POINTER(c_double),  # valueArray (double*)
+        c_int,  # valueArraySize (int)
+        POINTER(c_int),  # qualityArray (int*)
+        c_int,  # qualityArraySize (int)
+        c_int,  # saveAsFloat (int)
+        c_char_p,  # units (const char*)
+        c_char_p,  # type (const char*)
+        c_char_p,  # timeZoneName (const char*)
+        c_int,  # storageFlag (int)
+    ], c_int),
+    "hec_dss_tsStoreIregular": ([
+        c_void_p,  # dss (void*)
+        c_char_p,  # pathname (const char*)
+        c_char_p,  # startDateBase (const char*)
+        POINTER(c_int),  # times (int*)
+        c_int,  # timeGranularitySeconds (int)
+        POINTER(c_double),  # valueArray (double*)
+        c_int,  # valueArraySize (int)
+        POINTER(c_int),  # qualityArray (int*)
+        c_int,  # qualityArraySize (int)
+        c_int,  # saveAsFloat (int)
+        c_char_p,  # units (const char*)
+        c_char_p,  # type (const char*)
+        c_char_p,  # timeZoneName (const char*)
+        c_int,  # storageFlag (int)
+    ], c_int),
+    "hec_dss_recordType": ([c_void_p, c_char_p], c_int),
+    "hec_dss_arrayRetrieveInfo": ([
+        c_void_p,  # dss_file* dss
+        c_char_p,  # const char* pathname
+        POINTER(c_int),  # int* intValuesRead
+        POINTER(c_int),  # int* floatValuesRead
+        POINTER(c_int),  # int* doubleValuesRead
+    ], c_int),
+    "hec_dss_arrayStore": ([
+        c_void_p,  # dss_file* dss
+        c_char_p,  # const char* pathname
+        POINTER(c_int),  # int* intValues
+        c_int,  # const int intValuesLength
+        POINTER(c_float),  # float* floatValues
+        c_int,  # const int floatValuesLength
+        POINTER(c_double),  # double* doubleValues
+        c_int,  # const int doubleValuesLength
+    ], c_int),
+    "hec_dss_arrayRetrieve": ([
+        c_void_p,  # dss_file*
+        c_char_p,  # const char* - pathname
+        POINTER(c_int),  # int* intValues
+        c_int,  # const int intValuesLength
+        POINTER(c_float),  # float* floatValues
+        c_int,  # const int floatValuesLength
+        POINTER(c_double),  # double* doubleValues
+        c_int,  # const int doubleValuesLength
+    ], c_int),
+    "hec_dss_locationRetrieve": ([
+        c_void_p,  # dss
+        c_char_p,  # fullPath
+        POINTER(c_double),  # x
+        POINTER(c_double),  # y
+        POINTER(c_double),  # z
+        POINTER(c_int),  # coordinateSystem
+        POINTER(c_int),  # coordinateID
+        POINTER(c_int),  # horizontalUnits
+        POINTER(c_int),  # horizontalDatum
+        POINTER(c_int),  # verticalUnits
+        POINTER(c_int),  # verticalDatum
+        c_char_p,  # timeZoneName
+        c_int,  # timeZoneNameLength
+        c_char_p,  # supplemental
+        c_int,  # supplementalLength
+    ], c_int),
+    "hec_dss_locationStore": ([
+        c_void_p,  # dss
+        c_char_p,  # fullPath
+        c_double,  # x
+        c_double,  # y
+        c_double,  # z
+        c_int,  # coordinateSystem
+        c_int,  # coordinateID
+        c_int,  # horizontalUnits
+        c_int,  # horizontalDatum
+        c_int,  # verticalUnits
+        c_int,  # verticalDatum
+        c_char_p,  # timeZoneName
+        c_char_p,  # supplemental
+        c_int,  # replace
+    ], c_int),
+    "hec_dss_delete": ([
+        c_void_p,  # dss_file* dss
+        c_char_p,  # const char* pathname
+    ], c_int),
+    "hec_dss_textStore": ([
+        c_void_p,  # dss
+        c_char_p,  # pathname
+        c_char_p,  # text
+        c_int,  # length
+    ], c_int),
+    "hec_dss_textRetrieve": ([
+        c_void_p,  # dss
+        c_char_p,  # pathname
+        c_char_p,  # buffer
+        c_int,  # buff_size
+    ], c_int),
+}
+
+
+def _array_pointer(arr: np.ndarray, dtype, ctype):
+    """returns a ctypes pointer to the buffer of `arr` (no copy).
+
+    The array must already have the given dtype and be C-contiguous,
+    since the native library reads and writes the memory in place.
+    """
+    if arr.dtype != dtype or not arr.flags["C_CONTIGUOUS"]:
+        raise ValueError(f"expected a C-contiguous {np.dtype(dtype).name} array, got {arr.dtype}")
+    return arr.ctypes.data_as(POINTER(ctype))
+
 
 class _Native:
     """Wrapper for Native method calls to hecdss.dll or libhecdss.so
     _Native should not be used directly; Use HecDss
+
+    The shared library is loaded once per process, and the ctypes
+    prototypes in _PROTOTYPES are bound at that time, so each wrapper
+    method only pays for the native call itself.
     """
 
-    def load_hecdss_library(self, libname):
+    _dll = None
+    _functions = {}
+    _load_lock = threading.Lock()  # also guards _thread_counts
+    _local = threading.local()  # per-thread call Counter, so counting needs no lock
+    _thread_counts = []  # the Counter of every thread that made a native call
+
+    @staticmethod
+    def load_hecdss_library(libname):
         """
         searches and loads [lib]hecdss.[dll|so]
         """
@@ -32,15 +332,67 @@ class _Native:
             raise FileNotFoundError(f"{libname} not found Paths searched: {paths_to_try}")
         return ctypes.CDLL(found_libs[0])
 
+    @staticmethod
+    def _bind_prototypes(dll):
+        """returns a table of the library functions with argtypes/restype assigned"""
+        functions = {}
+        for name, (argtypes, restype) in _PROTOTYPES.items():
+            try:
+                f = getattr(dll, name)
+            except AttributeError:
+                # older builds of the library may not export everything
+                continue
+            f.argtypes = argtypes
+            f.restype = restype
+            functions[name] = f
+        return functions
+
+    @classmethod
+    def _load(cls):
+        """loads the shared library the first time it is needed (process-wide)"""
+        if cls._dll is None:
+            with cls._load_lock:
+                if cls._dll is None:
+                    libname = "hecdss.dll" if sys.platform == "win32" else "libhecdss.so"
+                    dll = cls.load_hecdss_library(libname)
+                    cls._functions = cls._bind_prototypes(dll)
+                    cls._dll = dll
+        return cls._dll
+
+    @classmethod
+    def call_counts(cls) -> dict:
+        """number of calls made to each native function, keyed by function name"""
+        total = Counter()
+        with cls._load_lock:
+            for counts in cls._thread_counts:
+                total.update(counts)
+        return dict(total)
+
+    @classmethod
+    def reset_call_counts(cls):
+        """clears the native call counters"""
+        with cls._load_lock:
+            for counts in cls._thread_counts:
+                counts.clear()
 
     def __init__(self):
-        """Loads the hecdss shared library from disk"""
+        """Gets the (shared) hecdss library, loading it from disk on first use"""
 
         self.handle = None
-        if sys.platform == "win32":
-            self.dll = self.load_hecdss_library("hecdss.dll")
-        else:
-            self.dll = self.load_hecdss_library("libhecdss.so")
+        self.dll = self._load()
+
+    def _fn(self, name):
+        """returns the prebound native function `name` and counts the call"""
+        counts = getattr(_Native._local, "counts", None)
+        if counts is None:
+            counts = _Native._local.counts = Counter()
+            with _Native._load_lock:
+                _Native._thread_counts.append(counts)
+        counts[name] += 1
+        try:
+            return _Native._functions[name]
+        except KeyError:
+            raise AttributeError(f"function '{name}' not found in {self.dll._name}") from None
 
     def hec_dss_open(self, dss_filename: str) -> int:
         """opens a DSS file and gets a handle
@@ -51,12 +403,7 @@ class _Native:
         Returns:
             int: status of zero when successful, non-zero on error.
         """
-        f = self.dll.hec_dss_open
-        f.argtypes = [
-            c_char_p,
-            POINTER(c_void_p),
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_open")
         self.handle = c_void_p()
         rval = f(dss_filename.encode("utf-8"), ctypes.byref(self.handle))
         if rval != 0:
@@ -69,22 +416,16 @@ class _Native:
         Returns:
             int: status of zero when successful, non-zero on error.
         """
-        f = self.dll.hec_dss_close
-        f.argtypes = [c_void_p()]
-        f.restype = c_int
+        f = self._fn("hec_dss_close")
         return f(self.handle)
 
     def hec_dss_record_count(self):
-        f = self.dll.hec_dss_record_count
-        f.argtypes = [c_void_p()]
-        f.restype = c_int
+        f = self._fn("hec_dss_record_count")
         return f(self.handle)
 
     # set a integer setting by name
     def __hec_dss_set_value(self, name: str, value: int):
-        f = self.dll.hec_dss_set_value
-        f.argtypes = [c_char_p, c_int]
-        f.restype = c_int
+        f = self._fn("hec_dss_set_value")
         f(name.encode("utf-8"), value)
 
     # set debug level (0-15)
@@ -98,66 +439,74 @@ class _Native:
     def hec_dss_export_to_file(
             self, path: str, outputFile: str, startDate: str, startTime: str, endDate: str, endTime: str
     ):
-        f = self.dll.hec_dss_export_to_file
-        f.argtypes = [
-            c_void_p(),  # dss
-            c_char_p,  # path
-            c_char_p,  # outputFile
-            c_char_p,  # startDate
-            c_char_p,  # startTime
-            c_char_p,  # endDate
-            c_char_p,  # endTime
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_export_to_file")
 
         result = f(
             self.handle, path, outputFile, startDate, startTime, endDate, endTime
         )
 
     def hec_dss_CONSTANT_MAX_PATH_SIZE(self):
-        f = self.dll.hec_dss_CONSTANT_MAX_PATH_SIZE
-        f.restype = c_int
+        f = self._fn("hec_dss_CONSTANT_MAX_PATH_SIZE")
         return f()
 
-    def hec_dss_catalog(self, filter=""):
+    def _catalog_buffers(self, filter=""):
         """
-        retrieves a list of objects in a DSS database
+        calls hec_dss_catalog, growing the buffers until every match fits
 
-        returns a list of paths, and recordTypes
+        With a filter the buffers start small, so a narrow filter only holds the
+        matching paths in memory. If the matches fill them, the call is made once
+        more with room for every record; each call scans the whole file.
 
+        returns the raw path buffer, recordTypes, number of records and path size
         """
         count = self.hec_dss_record_count()
         pathBufferSize = self.hec_dss_CONSTANT_MAX_PATH_SIZE()
-        self.dll.hec_dss_catalog.argtypes = [
-            c_void_p,  # dss (assuming it's a pointer)
-            c_char_p,  # pathBuffer
-            POINTER(c_int),  # recordTypes
-            c_char_p,  # pathFilter
-            c_int,  # count
-            c_int,  # pathBufferItemSize
-        ]
-        self.dll.hec_dss_catalog.restype = c_int
-
-        c_rawCatalog = create_string_buffer(count * pathBufferSize)
         pathFilter = filter.encode("ascii")
-        recordTypes = (c_int32 * count)()
+        capacity = count
+        if filter:
+            capacity = min(count, _CATALOG_FILTER_CAPACITY)
+
+        while True:
+            c_rawCatalog = create_string_buffer(max(capacity, 1) * pathBufferSize)
+            recordTypes = (c_int32 * max(capacity, 1))()
+            numRecords = self._fn("hec_dss_catalog")(
+                self.handle, c_rawCatalog, recordTypes, pathFilter, capacity, pathBufferSize
+            )
+            if numRecords < capacity or capacity >= count:
+                break
+            capacity = count
+
+        return c_rawCatalog, recordTypes, max(numRecords, 0), pathBufferSize
 
-        pathNameList = []
+    def hec_dss_catalog(self, filter=""):
+        """
+        retrieves a list of objects in a DSS database
 
-        numRecords = self.dll.hec_dss_catalog(
-            self.handle, c_rawCatalog, recordTypes, pathFilter, count, pathBufferSize
-        )
+        filter is a DSS pathname filter, such as "/*/COYOTE/*/*/*/*/", empty for all records
+
+        returns a list of paths, and recordTypes
+
+        """
+        pathNameList = []
         recordTypeArray = []
-        recordTypeArray.extend(list(recordTypes[:count]))
-        for i in range(numRecords):
-            start = i * pathBufferSize
-            end = start + pathBufferSize
-            s = c_rawCatalog[start:end].decode("ascii").replace("\x00", "")
-            # print(f"str='{s}'")
-            pathNameList.append(s)
+        for path, recordType in self.hec_dss_catalog_iter(filter):
+            pathNameList.append(path)
+            recordTypeArray.append(recordType)
 
         return pathNameList, recordTypeArray
 
+    def hec_dss_catalog_iter(self, filter=""):
+        """
+        same as hec_dss_catalog, but yields (path, recordType) one record at a time.
+        each path is decoded only when it is reached.
+        """
+        c_rawCatalog, recordTypes, numRecords, pathBufferSize = self._catalog_buffers(filter)
+        # read each path slot straight from the native buffer, without copying the whole buffer
+        address = ctypes.addressof(c_rawCatalog)
+        for i in range(numRecords):
+            slot = ctypes.string_at(address + i * pathBufferSize, pathBufferSize)
+            yield slot.split(b"\x00", 1)[0].decode("ascii"), recordTypes[i]
+
     def hec_dss_gridRetrieve(self, pathname: str,
                              gridType: List[int], dataType: List[int],
                              lowerLeftCellX: List[int], lowerLeftCellY: List[int],
@@ -179,29 +528,17 @@ class _Native:
                              data: List[float], dataLength: int = 0,
                              dataUnitsLength: int = 40, dataSourceLength: int = 40,
                              srsNameLength: int = 40, srsDefinitionLength: int = 600,
-                             timeZoneIDLength: int = 40, rangeTablesLength: int = 0, ):
-
-        self.dll.hec_dss_gridRetrieve.argtypes = [c_void_p, c_char_p, c_int,
-                                                  POINTER(c_int), POINTER(c_int),
-                                                  POINTER(c_int), POINTER(c_int),
-                                                  POINTER(c_int), POINTER(c_int),
-                                                  POINTER(c_int), POINTER(c_int),
-                                                  POINTER(c_int), POINTER(c_int),
-                                                  POINTER(c_int),
-                                                  c_char_p, c_int,
-                                                  c_char_p, c_int,
-                                                  c_char_p, c_int,
-                                                  c_char_p, c_int,
-                                                  c_char_p, c_int,
-                                                  POINTER(c_float), POINTER(c_float),
-                                                  POINTER(c_float), POINTER(c_float),
-                                                  POINTER(c_float), POINTER(c_float),
-                                                  POINTER(c_float),
-                                                  POINTER(c_float), c_int,
-                                                  POINTER(c_int),
-                                                  POINTER(c_float), c_int]
-
-        self.dll.hec_dss_gridRetrieve.restype = c_int
+                             timeZoneIDLength: int = 40, rangeTablesLength: int = 0,
+                             dataArray: np.ndarray = None):
+        """
+        retrieves a grid. By default the library is called twice, first for the
+        dimensions and then for the data, which is appended to `data`.
+
+        When dataArray (C-contiguous float32) is given, a single call is made and the
+        cells are written straight into it; `data` is left unchanged. dataLength and
+        rangeTablesLength should then come from an earlier read of the same grid series.
+        An empty dataArray reads only the header.
+        """
 
         # Type conversions and buffer initializations
         type_pointer = c_int()
@@ -237,56 +574,67 @@ class _Native:
         c_numberEqualOrExceedingRangeLimit = (c_int * rangeTablesLength)()
 
         c_data = (c_float * 0)()
+        retrieveData = True
+
+        if dataArray is None:
+            result = self._fn("hec_dss_gridRetrieve")(self.handle, pathname.encode("utf-8"), False,
+                                                        ctypes.byref(type_pointer), ctypes.byref(dataType_pointer),
+                                                        c_lowerLeftCellX, c_lowerLeftCellY,
+                                                        c_numberOfCellsX, c_numberOfCellsY,
+                                                        c_numberOfRanges, c_srsDefinitionType,
+                                                        ctypes.byref(c_timeZoneRawOffset), c_isInterval,
+                                                        c_isTimeStamped,
+                                                        c_dataUnits, dataUnitsLength,
+                                                        c_dataSource, dataSourceLength,
+                                                        c_srsName, srsNameLength,
+                                                        c_srsDefinition, srsDefinitionLength,
+                                                        c_timeZoneID, timeZoneIDLength,
+                                                        ctypes.byref(c_cellSize), ctypes.byref(c_xCoordOfGridCellZero),
+                                                        ctypes.byref(c_yCoordOfGridCellZero), ctypes.byref(c_nullValue),
+                                                        ctypes.byref(c_maxDataValue), ctypes.byref(c_minDataValue),
+                                                        ctypes.byref(c_meanDataValue),
+                                                        c_rangeLimitTable, rangeTablesLength,
+                                                        c_numberEqualOrExceedingRangeLimit,
+                                                        c_data, dataLength)
+            if result != 0:
+                print("boolRetriveData False, Function call failed with result:", result)
+                return result
 
-        result = self.dll.hec_dss_gridRetrieve(self.handle, pathname.encode("utf-8"), False,
-                                               ctypes.byref(type_pointer), ctypes.byref(dataType_pointer),
-                                               c_lowerLeftCellX, c_lowerLeftCellY,
-                                               c_numberOfCellsX, c_numberOfCellsY,
-                                               c_numberOfRanges, c_srsDefinitionType,
-                                               ctypes.byref(c_timeZoneRawOffset), c_isInterval,
-                                               c_isTimeStamped,
-                                               c_dataUnits, dataUnitsLength,
-                                               c_dataSource, dataSourceLength,
-                                               c_srsName, srsNameLength,
-                                               c_srsDefinition, srsDefinitionLength,
-                                               c_timeZoneID, timeZoneIDLength,
-                                               ctypes.byref(c_cellSize), ctypes.byref(c_xCoordOfGridCellZero),
-                                               ctypes.byref(c_yCoordOfGridCellZero), ctypes.byref(c_nullValue),
-                                               ctypes.byref(c_maxDataValue), ctypes.byref(c_minDataValue),
-                                               ctypes.byref(c_meanDataValue),
-                                               c_rangeLimitTable, rangeTablesLength,
-                                               c_numberEqualOrExceedingRangeLimit,
-                                               c_data, dataLength)
-        if result != 0:
-            print("boolRetriveData False, Function call failed with result:", result)
-            return result
-
-        rangeTablesLength = c_numberOfRanges.value
-        c_rangeLimitTable = (c_float * rangeTablesLength)()
-        c_numberEqualOrExceedingRangeLimit = (c_int * rangeTablesLength)()
-
-        dataLength = dataLength if dataLength else c_numberOfCellsX.value * c_numberOfCellsY.value
-        c_data = (c_float * dataLength)()
+            rangeTablesLength = c_numberOfRanges.value
+            c_rangeLimitTable = (c_float * rangeTablesLength)()
+            c_numberEqualOrExceedingRangeLimit = (c_int * rangeTablesLength)()
 
-        result = self.dll.hec_dss_gridRetrieve(self.handle, pathname.encode("utf-8"), True,
-                                               ctypes.byref(type_pointer), ctypes.byref(dataType_pointer),
-                                               c_lowerLeftCellX, c_lowerLeftCellY,
-                                               c_numberOfCellsX, c_numberOfCellsY,
-                                               c_numberOfRanges, c_srsDefinitionType,
-                                               ctypes.byref(c_timeZoneRawOffset), c_isInterval,
-                                               c_isTimeStamped,
-                                               c_dataUnits, dataUnitsLength,
-                                               c_dataSource, dataSourceLength,
-                                               c_srsName, srsNameLength,
-                                               c_srsDefinition, srsDefinitionLength,
-                                               c_timeZoneID, timeZoneIDLength,
-                                               ctypes.byref(c_cellSize), ctypes.byref(c_xCoordOfGridCellZero),
-                                               ctypes.byref(c_yCoordOfGridCellZero), ctypes.byref(c_nullValue),
-                                               ctypes.byref(c_maxDataValue), ctypes.byref(c_minDataValue),
-                                               ctypes.byref(c_meanDataValue),
-                                               c_rangeLimitTable, rangeTablesLength,
-                                               c_numberEqualOrExceedingRangeLimit,
-                                               c_data, dataLength)
+            dataLength = dataLength if dataLength else c_numberOfCellsX.value * c_numberOfCellsY.value
+            c_data = (c_float * dataLength)()
+        else:
+            retrieveData = dataArray.size > 0
+            if retrieveData:
+                dataLength = dataLength if dataLength else dataArray.size
+                if dataLength > dataArray.size:
+                    raise ValueError(f"dataArray has {dataArray.size} cells, {dataLength} are needed")
+                c_data = _array_pointer(dataArray, np.float32, c_float)
+            else:
+                dataLength = 0
+
+        result = self._fn("hec_dss_gridRetrieve")(self.handle, pathname.encode("utf-8"), retrieveData,
+                                                    ctypes.byref(type_pointer), ctypes.byref(dataType_pointer),
+                                                    c_lowerLeftCellX, c_lowerLeftCellY,
+                                                    c_numberOfCellsX, c_numberOfCellsY,
+                                                    c_numberOfRanges, c_srsDefinitionType,
+                                                    ctypes.byref(c_timeZoneRawOffset), c_isInterval,
+                                                    c_isTimeStamped,
+                                                    c_dataUnits, dataUnitsLength,
+                                                    c_dataSource, dataSourceLength,
+                                                    c_srsName, srsNameLength,
+                                                    c_srsDefinition, srsDefinitionLength,
+                                                    c_timeZoneID, timeZoneIDLength,
+                                                    ctypes.byref(c_cellSize), ctypes.byref(c_xCoordOfGridCellZero),
+                                                    ctypes.byref(c_yCoordOfGridCellZero), ctypes.byref(c_nullValue),
+                                                    ctypes.byref(c_maxDataValue), ctypes.byref(c_minDataValue),
+                                                    ctypes.byref(c_meanDataValue),
+                                                    c_rangeLimitTable, rangeTablesLength,
+                                                    c_numberEqualOrExceedingRangeLimit,
+                                                    c_data, dataLength)
 
         # Processing results
         if result == 0:
@@ -319,9 +667,11 @@ class _Native:
             minDataValue[0] = c_minDataValue.value
             meanDataValue[0] = c_meanDataValue.value
 
-            rangeLimitTable.extend(list(c_rangeLimitTable))
-            numberEqualOrExceedingRangeLimit.extend(list(c_numberEqualOrExceedingRangeLimit))
-            data.extend(list(c_data))
+            rangeTablesLength = min(rangeTablesLength, c_numberOfRanges.value)
+            rangeLimitTable.extend(list(c_rangeLimitTable[:rangeTablesLength]))
+            numberEqualOrExceedingRangeLimit.extend(list(c_numberEqualOrExceedingRangeLimit[:rangeTablesLength]))
+            if dataArray is None:
+                data.extend(list(c_data))
 
             # print("Function call successful:")
         else:
@@ -335,39 +685,6 @@ class _Native:
             compressedData=None,
             compressionSize=0,
     ):
-        self.dll.hec_dss_pdStore.restype = c_int
-        self.dll.hec_dss_pdStore.argtypes = [
-            ctypes.POINTER(ctypes.c_void_p),  # dss (dss file pointer)
-            ctypes.c_char_p,  # pathname
-            ctypes.c_int,  # gridType
-            ctypes.c_int,  # dataType
-            ctypes.c_int,  # lowerLeftCellX
-            ctypes.c_int,  # lowerLeftCellY
-            ctypes.c_int,  # numberOfCellsX
-            ctypes.c_int,  # numberOfCellsY
-            ctypes.c_int,  # numberOfRanges
-            ctypes.c_int,  # srsDefinitionType
-            ctypes.c_int,  # timeZoneRawOffset
-            ctypes.c_int,  # isInterval
-            ctypes.c_int,  # isTimeStamped
-            ctypes.c_int,  # compressionSize
-            ctypes.c_char_p,  # dataUnits
-            ctypes.c_char_p,  # dataSource
-            ctypes.c_char_p,  # srsName
-            ctypes.c_char_p,  # srsDefinition
-            ctypes.c_char_p,  # timeZoneID
-            ctypes.c_float,  # cellSize
-            ctypes.c_float,  # xCoordOfGridCellZero
-            ctypes.c_float,  # yCoordOfGridCellZero
-            ctypes.c_float,  # nullValue
-            ctypes.c_float,  # maxDataValue
-            ctypes.c_float,  # minDataValue
-            ctypes.c_float,  # meanDataValue
-            ctypes.POINTER(ctypes.c_float),  # rangeLimitTable
-            ctypes.POINTER(ctypes.c_int),  # numberEqualOrExceedingRangeLimit
-            ctypes.POINTER(ctypes.c_float)  # data
-        ]
-
         c_pathname = c_char_p(gd.id.encode("utf-8"))
 
         c_gridType = c_int(gd.type)
@@ -408,18 +725,18 @@ class _Native:
             arr = gd.data.astype('float32', copy=False)
             c_data = arr.ctypes.data_as(ctypes.POINTER(ctypes.c_float))
 
-        return self.dll.hec_dss_gridStore(self.handle, c_pathname, c_gridType, c_dataType,
-                                          c_lowerLeftCellX, c_lowerLeftCellY,
-                                          c_numberOfCellsX, c_numberOfCellsY,
-                                          c_numberOfRanges, c_srsDefinitionType,
-                                          c_timeZoneRawOffset, c_isInterval,
-                                          c_isTimeStamped, c_compressionSize,
-                                          c_dataUnits, c_dataSource,
-                                          c_srsName, c_srsDefinition, c_timeZoneID,
-                                          c_cellSize, c_xCoordOfGridCellZero,
-                                          c_yCoordOfGridCellZero, c_nullValue,
-                                          c_maxDataValue, c_minDataValue, c_meanDataValue,
-                                          c_rangeLimitTable, c_numberEqualOrExceedingRangeLimit, c_data)
+        return self._fn("hec_dss_gridStore")(self.handle, c_pathname, c_gridType, c_dataType,
+                                               c_lowerLeftCellX, c_lowerLeftCellY,
+                                               c_numberOfCellsX, c_numberOfCellsY,
+                                               c_numberOfRanges, c_srsDefinitionType,
+                                               c_timeZoneRawOffset, c_isInterval,
+                                               c_isTimeStamped, c_compressionSize,
+                                               c_dataUnits, c_dataSource,
+                                               c_srsName, c_srsDefinition, c_timeZoneID,
+                                               c_cellSize, c_xCoordOfGridCellZero,
+                                               c_yCoordOfGridCellZero, c_nullValue,
+                                               c_maxDataValue, c_minDataValue, c_meanDataValue,
+                                               c_rangeLimitTable, c_numberEqualOrExceedingRangeLimit, c_data)
 
     def hec_dss_pdRetrieveInfo(self, pathname,
                                numberOrdinates: List[int], numberCurves: List[int],
@@ -428,14 +745,6 @@ class _Native:
                                typeIndependent: List[str],
                                typeDependent: List[str],
                                labelsLength):
-        self.dll.hec_dss_pdRetrieveInfo.argtypes = [c_void_p, c_char_p,
-                                                    POINTER(c_int), POINTER(c_int),
-                                                    c_char_p, c_int,
-                                                    c_char_p, c_int,
-                                                    c_char_p, c_int,
-                                                    c_char_p]
-
-        self.dll.hec_dss_pdRetrieveInfo.restype = c_int
         numberOrdinates_val = c_int()
         numberCurves_val = c_int()
         labelsLength_val = c_int()
@@ -447,7 +756,7 @@ class _Native:
         c_typeIndependent = create_string_buffer(buff_size)
         c_typeDependent = create_string_buffer(buff_size)
 
-        result = self.dll.hec_dss_pdRetrieveInfo(
+        result = self._fn("hec_dss_pdRetrieveInfo")(
             self.handle,
             pathname.encode("utf-8"),
             ctypes.byref(numberOrdinates_val),
@@ -487,22 +796,21 @@ class _Native:
                            typeDependent: List[str], typeDependentLength: int,
                            labels: List[str], labelsLength: int,
                            timeZoneName: List[str], timeZoneNameLength: int):
-
-        self.dll.hec_dss_pdRetrieve.argtypes = [c_void_p, c_char_p,
-                                                POINTER(c_double), c_int,
-                                                POINTER(c_double), c_int,
-                                                POINTER(c_int), POINTER(c_int),
-                                                c_char_p, c_int,
-                                                c_char_p, c_int,
-                                                c_char_p, c_int,
-                                                c_char_p, c_int,
-                                                c_char_p, c_int,
-                                                c_char_p, c_int]
-
-        self.dll.hec_dss_pdRetrieve.restype = c_int
-
-        c_doubleOrdinates = (c_double * doubleOrdinatesLength)()
-        c_doubleValues = (c_double * doubleValuesLength)()
+        """
+        retrieves paired data. Ordinates and values are appended to the doubleOrdinates
+        and doubleValues lists, or, when they are C-contiguous float64 numpy arrays of at
+        least the given lengths, written straight into them.
+        Values are stored curve by curve (all ordinates of the first curve, then the next).
+        """
+        zero_copy = isinstance(doubleOrdinates, np.ndarray)
+        if zero_copy:
+            if doubleOrdinates.size < doubleOrdinatesLength or doubleValues.size < doubleValuesLength:
+                raise ValueError("paired data arrays are smaller than the lengths given")
+            c_doubleOrdinates = _array_pointer(doubleOrdinates, np.float64, c_double)
+            c_doubleValues = _array_pointer(doubleValues, np.float64, c_double)
+        else:
+            c_doubleOrdinates = (c_double * doubleOrdinatesLength)()
+            c_doubleValues = (c_double * doubleValuesLength)()
         c_numberOrdinates = c_int()
         c_numberCurves = c_int()
 
@@ -514,18 +822,18 @@ class _Native:
 
         c_timeZoneName = create_string_buffer(timeZoneNameLength)
 
-        result = self.dll.hec_dss_pdRetrieve(self.handle,
-                                             pathname.encode("utf-8"),
-                                             c_doubleOrdinates, doubleOrdinatesLength,
-                                             c_doubleValues, doubleValuesLength,
-                                             ctypes.byref(c_numberOrdinates),
-                                             ctypes.byref(c_numberCurves),
-                                             c_unitsIndependent, unitsIndependentLength,
-                                             c_typeIndependent, typeIndependentLength,
-                                             c_unitsDependent, unitsDependentLength,
-                                             c_typeDependent, typeDependentLength,
-                                             c_labels, labelsLength,
-                                             c_timeZoneName, timeZoneNameLength)
+        result = self._fn("hec_dss_pdRetrieve")(self.handle,
+                                                  pathname.encode("utf-8"),
+                                                  c_doubleOrdinates, doubleOrdinatesLength,
+                                                  c_doubleValues, doubleValuesLength,
+                                                  ctypes.byref(c_numberOrdinates),
+                                                  ctypes.byref(c_numberCurves),
+                                                  c_unitsIndependent, unitsIndependentLength,
+                                                  c_typeIndependent, typeIndependentLength,
+                                                  c_unitsDependent, unitsDependentLength,
+                                                  c_typeDependent, typeDependentLength,
+                                                  c_labels, labelsLength,
+                                                  c_timeZoneName, timeZoneNameLength)
 
         if result == 0:
             unitsIndependent[0] = c_unitsIndependent.value.decode('utf-8')
@@ -533,8 +841,9 @@ class _Native:
             typeIndependent[0] = c_typeIndependent.value.decode('utf-8')
             typeDependent[0] = c_typeDependent.value.decode('utf-8')
 
-            doubleOrdinates.extend(list(c_doubleOrdinates))
-            doubleValues.extend(list(c_doubleValues))
+            if not zero_copy:
+                doubleOrdinates.extend(list(c_doubleOrdinates))
+                doubleValues.extend(list(c_doubleValues))
             numberOrdinates[0] = c_numberOrdinates
             numberCurves[0] = c_numberCurves
             labels.extend(c_labels.raw.decode('utf-8').split("\0")[:c_numberCurves.value])
@@ -550,25 +859,6 @@ class _Native:
             pd,
     ):
 
-        self.dll.hec_dss_pdStore.restype = c_int
-        self.dll.hec_dss_pdStore.argtypes = [
-            c_void_p,  # dss (void*)
-            c_char_p,  # pathname (const char*)
-            POINTER(c_double),  # ordinatesArray (double*)
-            c_int,  # ordinatesLength (int)
-            POINTER(c_double),  # valuesArray (double*)
-            c_int,  # valuesLength (int)
-            c_int,  # numberOrdinates (int)
-            c_int,  # NumberCurves (int)
-            c_char_p,  # unitsIndependent (const char*)
-            c_char_p,  # typeIndependent (const char*)
-            c_char_p,  # unitsDependent (const char*)
-            c_char_p,  # typeDependent (const char*)
-            c_char_p,  # labels (const char*)
-            c_int,  # labelsLength (int)
-            c_char_p,  # timeZoneName (const char*) - New argument
-        ]
-
         numberCurves = len(pd.values[0])
         if numberCurves > 1:
             _values = pd.values.tolist()
@@ -594,7 +884,7 @@ class _Native:
         c_labelsLength = len(flat_labels)
         c_timeZoneName = c_char_p(pd.time_zone_name.encode("utf-8"))  # New argument
 
-        return self.dll.hec_dss_pdStore(
+        return self._fn("hec_dss_pdStore")(
             self.handle,
             c_pathname,
             c_Ordinates,
@@ -622,22 +912,10 @@ class _Native:
             numberValues,
             qualityElementSize,
     ):
-        self.dll.hec_dss_tsGetSizes.argtypes = [
-            c_void_p(),  # dss
-            c_char_p,  # path
-            c_char_p,  # startDate
-            c_char_p,  # startTime
-            c_char_p,  # endDate
-            c_char_p,  # endTime
-            POINTER(c_int),  # numberValues
-            POINTER(c_int),  # qualityElementSize
-        ]
-        self.dll.hec_dss_tsGetSizes.restype = c_int
-
         nv = c_int()
         qes = c_int()
 
-        result = self.dll.hec_dss_tsGetSizes(
+        result = self._fn("hec_dss_tsGetSizes")(
             self.handle,
             pathname.encode("utf-8"),
             startDate.encode("utf-8"),
@@ -665,24 +943,13 @@ class _Native:
             lastValidJulian,
             lastSeconds,
     ):
-        self.dll.hec_dss_tsGetDateTimeRange.argtypes = [
-            c_void_p(),  # dss
-            c_char_p,  # path
-            c_int,  # boolFullSet
-            POINTER(c_int),  # firstValidJulian
-            POINTER(c_int),  # firstSeconds
-            POINTER(c_int),  # lastValidJulian
-            POINTER(c_int),  # lastSeconds
-        ]
-        self.dll.hec_dss_tsGetDateTimeRange.restype = c_int
-
         fjul = c_int()
         fsec = c_int()
 
         ljul = c_int()
         lsec = c_int()
 
-        result = self.dll.hec_dss_tsGetDateTimeRange(
+        result = self._fn("hec_dss_tsGetDateTimeRange")(
             self.handle,
             pathname.encode("utf-8"),
             c_int(boolFullSet),
@@ -710,16 +977,7 @@ class _Native:
             julianEnd,
             endSeconds,
     ):
-        self.dll.hec_dss_numberPeriods.argtypes = [
-            c_int,  # intervalSeconds
-            c_int,  # julianStart
-            c_int,  # startSeconds
-            c_int,  # julianEnd
-            c_int,  # endSeconds
-        ]
-        self.dll.hec_dss_numberPeriods.restype = c_int
-
-        result = self.dll.hec_dss_numberPeriods(
+        result = self._fn("hec_dss_numberPeriods")(
             intervalSeconds,
             julianStart,
             startSeconds,
@@ -752,30 +1010,7 @@ class _Native:
             timeZoneNameLength: int,
     ):
 
-        f = self.dll.hec_dss_tsRetrieve
-        f.argtypes = [
-            c_void_p,  # dss
-            c_char_p,  # pathname
-            c_char_p,  # startDate
-            c_char_p,  # startTime
-            c_char_p,  # endDate
-            c_char_p,  # endTime
-            POINTER(c_int),  # timeArray
-            POINTER(c_double),  # valueArray
-            c_int,  # arraySize
-            POINTER(c_int),  # numberValuesRead
-            POINTER(c_int),  # quality
-            c_int,  # qualityLength
-            POINTER(c_int),  # julianBaseDate
-            POINTER(c_int),  # timeGranularitySeconds
-            c_char_p,  # units
-            c_int,  # unitsLength
-            c_char_p,  # dataType
-            c_int,  # typeLength
-            c_char_p,  # timeZoneName
-            c_int,  # timeZoneNameLength
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_tsRetrieve")
 
         c_arraySize = c_int(arraySize)
         c_times = (c_int32 * arraySize)()
@@ -836,6 +1071,86 @@ class _Native:
 
         return rval
 
+    def hec_dss_tsRetrieve_arrays(
+            self,
+            pathname: str,
+            startDate: str,
+            startTime: str,
+            endDate: str,
+            endTime: str,
+            times: np.ndarray,
+            values: np.ndarray,
+            numberValuesRead: List[int],
+            quality: np.ndarray,
+            qualityLength: int,
+            julianBaseDate: List[int],
+            timeGranularitySeconds: List[int],
+            units: List[str],
+            unitsLength: int,
+            dataType: List[str],
+            typeLength: int,
+            timeZoneName: List[str],
+            timeZoneNameLength: int,
+    ):
+        """same as hec_dss_tsRetrieve, but the library writes directly into preallocated NumPy arrays
+
+        Args:
+            times (np.ndarray): int32 array; its length is the arraySize passed to the library
+            values (np.ndarray): float64 array, same length as times
+            numberValuesRead (List[int]): receives the number of values written
+            quality (np.ndarray): int32 array of length qualityLength * len(times)
+                (may be empty when qualityLength is zero)
+
+        Returns:
+            int: status of zero when successful, non-zero on error.
+        """
+        f = self._fn("hec_dss_tsRetrieve")
+
+        arraySize = len(times)
+        if len(values) != arraySize:
+            raise ValueError("times and values arrays must be the same length")
+        if len(quality) < qualityLength * arraySize:
+            raise ValueError(f"quality array must hold at least {qualityLength * arraySize} values")
+
+        c_numberValuesRead = c_int(0)
+        c_julianBaseDate = c_int()
+        c_timeGranularitySeconds = c_int()
+        c_units = create_string_buffer(unitsLength)
+        c_dataType = create_string_buffer(typeLength)
+        c_timeZoneName = create_string_buffer(timeZoneNameLength)
+
+        rval = f(
+            self.handle,
+            pathname.encode("utf-8"),
+            startDate.encode("utf-8"),
+            startTime.encode("utf-8"),
+            endDate.encode("utf-8"),
+            endTime.encode("utf-8"),
+            _array_pointer(times, np.int32, c_int),
+            _array_pointer(values, np.float64, c_double),
+            arraySize,
+            byref(c_numberValuesRead),
+            _array_pointer(quality, np.int32, c_int),
+            qualityLength,
+            byref(c_julianBaseDate),
+            byref(c_timeGranularitySeconds),
+            c_units,
+            unitsLength,
+            c_dataType,
+            typeLength,
+            c_timeZoneName,
+            timeZoneNameLength,
+        )
+
+        numberValuesRead[0] = c_numberValuesRead.value
+        units[0] = c_units.value.decode("utf-8")
+        dataType[0] = c_dataType.value.decode("utf-8")
+        julianBaseDate[0] = c_julianBaseDate.value
+        timeGranularitySeconds[0] = c_timeGranularitySeconds.value
+        timeZoneName[0] = c_timeZoneName.value.decode("utf-8")
+
+        return rval
+
     def hec_dss_tsStoreRegular(
             self,
             pathname,
@@ -850,23 +1165,6 @@ class _Native:
             storageFlag,
     ):
 
-        self.dll.hec_dss_tsStoreRegular.restype = c_int
-        self.dll.hec_dss_tsStoreRegular.argtypes = [
-            c_void_p,  # dss (void*)
-            c_char_p,  # pathname (const char*)
-            c_char_p,  # startDate (const char*)
-            c_char_p,  # startTime (const char*)
-            POINTER(c_double),  # valueArray (double*)
-            c_int,  # valueArraySize (int)
-            POINTER(c_int),  # qualityArray (int*)
-            c_int,  # qualityArraySize (int)
-            c_int,  # saveAsFloat (int)
-            c_char_p,  # units (const char*)
-            c_char_p,  # type (const char*)
-            c_char_p,  # timeZoneName (const char*)
-            c_int,  # storageFlag (int)
-        ]
-
         c_pathname = c_char_p(pathname.encode("utf-8"))
         c_startDate = c_char_p(startDate.encode("utf-8"))
         c_startTime = c_char_p(startTime.encode("utf-8"))
@@ -874,10 +1172,13 @@ class _Native:
         c_type = c_char_p(dataType.encode("utf-8"))
         c_timeZoneName = c_char_p(timeZoneName.encode("utf-8"))  # New argument
 
-        c_valueArray = (c_double * len(valueArray))(*valueArray)
-        c_qualityArray = (c_int * len(qualityArray))(*qualityArray)
+        # numpy arrays of the right type are passed without a copy; lists are converted once
+        valueArray = np.ascontiguousarray(valueArray, dtype=np.float64)
+        qualityArray = np.ascontiguousarray(qualityArray, dtype=np.int32)
+        c_valueArray = _array_pointer(valueArray, np.float64, c_double)
+        c_qualityArray = _array_pointer(qualityArray, np.int32, c_int)
 
-        return self.dll.hec_dss_tsStoreRegular(
+        return self._fn("hec_dss_tsStoreRegular")(
             self.handle,
             c_pathname,
             c_startDate,
@@ -908,35 +1209,21 @@ class _Native:
             storageFlag,
     ):
 
-        self.dll.hec_dss_tsStoreIregular.restype = c_int
-        self.dll.hec_dss_tsStoreIregular.argtypes = [
-            c_void_p,  # dss (void*)
-            c_char_p,  # pathname (const char*)
-            c_char_p,  # startDateBase (const char*)
-            POINTER(c_int),  # times (int*)
-            c_int,  # timeGranularitySeconds (int)
-            POINTER(c_double),  # valueArray (double*)
-            c_int,  # valueArraySize (int)
-            POINTER(c_int),  # qualityArray (int*)
-            c_int,  # qualityArraySize (int)
-            c_int,  # saveAsFloat (int)
-            c_char_p,  # units (const char*)
-            c_char_p,  # type (const char*)
-            c_char_p,  # timeZoneName (const char*)
-            c_int, # storageFlag (int)
-        ]
-
         c_pathname = c_char_p(pathname.encode("utf-8"))
         c_startDateBase = c_char_p(startDateBase.encode("utf-8"))
         c_units = c_char_p(units.encode("utf-8"))
         c_type = c_char_p(dataType.encode("utf-8"))
         c_timeZoneName = c_char_p(timeZoneName.encode("utf-8"))  # New argument
 
-        c_valueArray = (c_double * len(valueArray))(*valueArray)
-        c_times = (c_int * len(times))(*times)
-        c_qualityArray = (c_int * len(qualityArray))(*qualityArray)
+        # numpy arrays of the right type are passed without a copy; lists are converted once
+        valueArray = np.ascontiguousarray(valueArray, dtype=np.float64)
+        times = np.ascontiguousarray(times, dtype=np.int32)
+        qualityArray = np.ascontiguousarray(qualityArray, dtype=np.int32)
+        c_valueArray = _array_pointer(valueArray, np.float64, c_double)
+        c_times = _array_pointer(times, np.int32, c_int)
+        c_qualityArray = _array_pointer(qualityArray, np.int32, c_int)
 
-        return self.dll.hec_dss_tsStoreIregular(
+        return self._fn("hec_dss_tsStoreIregular")(
             self.handle,
             c_pathname,
             c_startDateBase,
@@ -954,26 +1241,13 @@ class _Native:
         )
 
     def hec_dss_recordType(self, pathname):
-        f = self.dll.hec_dss_recordType
-        f.argtypes = [
-            c_void_p,
-            c_char_p
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_recordType")
         c_str = c_char_p(pathname.encode("utf-8"))
         return f(self.handle, c_str)
 
     def hec_dss_arrayRetrieveInfo(self, pathname: str, intValuesRead: List[int], floatValuesRead: List[int],
                                   doubleValuesRead: List[int]):
-        f = self.dll.hec_dss_arrayRetrieveInfo
-        f.argtypes = [
-            c_void_p(),  # dss_file* dss
-            c_char_p,  # const char* pathname
-            POINTER(c_int),  # int* intValuesRead
-            POINTER(c_int),  # int* floatValuesRead
-            POINTER(c_int)  # int* doubleValuesRead
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_arrayRetrieveInfo")
 
         c_intValuesRead = c_int()
         c_floatValuesRead = c_int()
@@ -989,86 +1263,39 @@ class _Native:
 
     def hec_dss_arrayStore(self, pathname: str, intValues: List[int], floatValues: List[float],
                            doubleValues: List[float]):
-        f = self.dll.hec_dss_arrayStore
-        f.argtypes = [
-            c_void_p,  # dss_file* dss
-            c_char_p,  # const char* pathname
-            POINTER(c_int),  # int* intValues
-            c_int,  # const int intValuesLength
-            POINTER(c_float),  # float* floatValues
-            c_int,  # const int floatValuesLength
-            POINTER(c_double),  # double* doubleValues
-            c_int  # const int doubleValuesLength
-        ]
-        f.restype = c_int
-
-        c_intValues = (c_int32 * len(intValues))(*intValues)
-        c_floatValues = (c_float * len(floatValues))(*floatValues)
-        c_doubleValues = (c_double * len(doubleValues))(*doubleValues)
-        return f(self.handle, pathname.encode('utf-8'), c_intValues, len(intValues),
-                 c_floatValues, len(floatValues),
-                 c_doubleValues, len(doubleValues))
-
-    def hec_dss_arrayRetrieve(self, pathname, intValues: List[int], floatValues: List[float],
-                              doubleValues: List[float]):
-        f = self.dll.hec_dss_arrayRetrieve
-
-        f.argtypes = (
-            c_void_p,  # dss_file*
-            c_char_p,  # const char* - pathname
-            POINTER(c_int),  # int* intValues
-            c_int,  # const int intValuesLength
-            POINTER(c_float),  # float* floatValues
-            c_int,  # const int floatValuesLength
-            POINTER(c_double),  # double* doubleValues
-            c_int  # const int doubleValuesLength
-        )
-        f.restype = c_int
-
-        c_intValues = (c_int32 * len(intValues))(*intValues)
-        c_floatValues = (c_float * len(floatValues))(*floatValues)
-        c_doubleValues = (c_double * len(doubleValues))(*doubleValues)
+        f = self._fn("hec_dss_arrayStore")
+
+        # int32/float32/float64 numpy arrays are passed without a copy
+        intValues = np.ascontiguousarray(intValues, dtype=np.int32)
+        floatValues = np.ascontiguousarray(floatValues, dtype=np.float32)
+        doubleValues = np.ascontiguousarray(doubleValues, dtype=np.float64)
+        return f(self.handle, pathname.encode('utf-8'),
+                 _array_pointer(intValues, np.int32, c_int32), intValues.size,
+                 _array_pointer(floatValues, np.float32, c_float), floatValues.size,
+                 _array_pointer(doubleValues, np.float64, c_double), doubleValues.size)
+
+    def hec_dss_arrayRetrieve(self, pathname, intValues: np.ndarray, floatValues: np.ndarray,
+                              doubleValues: np.ndarray):
+        """
+        reads an array record straight into C-contiguous int32, float32 and float64 arrays,
+        sized from hec_dss_arrayRetrieveInfo.
+        """
+        f = self._fn("hec_dss_arrayRetrieve")
 
         status = f(self.handle, pathname.encode('utf-8'),
-                   c_intValues, len(intValues),
-                   c_floatValues, len(floatValues),
-                   c_doubleValues, len(doubleValues))
-
-        if status == 0:
-            if len(intValues) > 0:
-                intValues[:] = np.ctypeslib.as_array(c_intValues, shape=(len(intValues),))
-            if len(floatValues) > 0:
-                floatValues[:] = np.ctypeslib.as_array(c_floatValues, shape=(len(floatValues),))
-            if len(doubleValues) > 0:
-                doubleValues[:] = np.ctypeslib.as_array(c_doubleValues, shape=(len(doubleValues),))
+                   _array_pointer(intValues, np.int32, c_int32), intValues.size,
+                   _array_pointer(floatValues, np.float32, c_float), floatValues.size,
+                   _array_pointer(doubleValues, np.float64, c_double), doubleValues.size)
 
-
-        else:
-            print("Error reading array status = {status}")
+        if status != 0:
+            print(f"Error reading array status = {status}")
+        return status
 
     def hec_dss_locationRetrieve(self, fullPath: str, x: List[float], y: List[float], z: List[float],
                                  coordinateSystem: List[int], coordinateID: List[int], horizontalUnits: List[int],
                                  horizontalDatum: List[int], verticalUnits: List[int], verticalDatum: List[int],
                                  timeZoneName: List[str], timeZoneNameLength: int, supplemental: List[str],
                                  supplementalLength: int):
-        self.dll.hec_dss_locationRetrieve.argtypes = [
-            c_void_p,  # dss
-            c_char_p,  # fullPath
-            POINTER(c_double),  # x
-            POINTER(c_double),  # y
-            POINTER(c_double),  # z
-            POINTER(c_int),  # coordinateSystem
-            POINTER(c_int),  # coordinateID
-            POINTER(c_int),  # horizontalUnits
-            POINTER(c_int),  # horizontalDatum
-            POINTER(c_int),  # verticalUnits
-            POINTER(c_int),  # verticalDatum
-            c_char_p,  # timeZoneName
-            c_int,  # timeZoneNameLength
-            c_char_p,  # supplemental
-            c_int  # supplementalLength
-        ]
-        self.dll.hec_dss_locationRetrieve.restype = c_int
 
         c_x = c_double()
         c_y = c_double()
@@ -1082,7 +1309,7 @@ class _Native:
         c_timeZoneName = create_string_buffer(timeZoneNameLength)
         c_supplemental = create_string_buffer(supplementalLength)
 
-        result = self.dll.hec_dss_locationRetrieve(
+        result = self._fn("hec_dss_locationRetrieve")(
             self.handle,
             fullPath.encode("utf-8"),
             byref(c_x),
@@ -1118,25 +1345,8 @@ class _Native:
         return result
 
     def hec_dss_locationStore(self, location_info, replace: int) -> int:
-        self.dll.hec_dss_locationStore.argtypes = [
-            c_void_p,  # dss
-            c_char_p,  # fullPath
-            c_double,  # x
-            c_double,  # y
-            c_double,  # z
-            c_int,  # coordinateSystem
-            c_int,  # coordinateID
-            c_int,  # horizontalUnits
-            c_int,  # horizontalDatum
-            c_int,  # verticalUnits
-            c_int,  # verticalDatum
-            c_char_p,  # timeZoneName
-            c_char_p,  # supplemental
-            c_int  # replace
-        ]
-        self.dll.hec_dss_locationStore.restype = c_int
 
-        result = self.dll.hec_dss_locationStore(
+        result = self._fn("hec_dss_locationStore")(
             self.handle,
             location_info.id.encode("utf-8"),
             location_info.x[0],
@@ -1168,12 +1378,7 @@ class _Native:
             Returns:
                 int: Status of zero when successful, non-zero on error.
             """
-            f = self.dll.hec_dss_delete
-            f.argtypes = [
-                c_void_p,  # dss_file* dss
-                c_char_p   # const char* pathname
-            ]
-            f.restype = c_int
+            f = self._fn("hec_dss_delete")
 
             result = f(self.handle, pathname.encode("utf-8"))
 
@@ -1190,14 +1395,7 @@ class _Native:
             text (str): The text data to store.
             length (int, optional): The length of the text. If None, it will be set to the length of the text.
         """
-        f = self.dll.hec_dss_textStore
-        f.argtypes = [
-            c_void_p,  # dss
-            c_char_p,  # pathname
-            c_char_p,  # text
-            c_int      # length
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_textStore")
 
         result = f(self.handle, pathname.encode("utf-8"),
                     text.encode("utf-8"), 
@@ -1205,27 +1403,21 @@ class _Native:
     
         return result
     
-    def hec_dss_textRetrieve(self, pathname, buffer :List[str], buff_size: int) -> int:
+    def hec_dss_textRetrieve(self, pathname, buffer :List[str], buff_size: int, decode: bool = True) -> int:
         """
-        Store text data in a DSS file.
+        Read text data from a DSS file.
         Args:
-            pathname (str): The DSS pathname where the text will be stored.
-            text (str): The text data to store.
-            length (int, optional): The length of the text. If None, it will be set to the length of the text.
+            pathname (str): The DSS pathname of the text record.
+            buffer (list): The text is appended to this list.
+            buff_size (int): Size of the read buffer in bytes, including the terminating null.
+            decode (bool, optional): When False the ctypes buffer itself is appended, not decoded text.
         """
-        f = self.dll.hec_dss_textRetrieve
-        f.argtypes = [
-            c_void_p,  # dss
-            c_char_p,  # pathname
-            c_char_p,  # buffer
-            c_int      # buff_size
-        ]
-        f.restype = c_int
+        f = self._fn("hec_dss_textRetrieve")
 
         c_buffer = create_string_buffer(buff_size)
         result = f(self.handle, pathname.encode("utf-8"),
                     c_buffer, 
                     buff_size)
     
-        buffer.append(c_buffer.value.decode("utf-8"))
+        buffer.append(c_buffer.value.decode("utf-8") if decode else c_buffer)
         return result
\ No newline at end of file
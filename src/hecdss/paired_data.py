@@ -1,6 +1,33 @@
 # import pandas as pd
+import copy
 import numpy as np
 
+from .dss_type import DssType
+
+UNDEFINED = -3.4028234663852886e+38
+
+
+def _defined(a):
+    """mask of values that are neither NaN nor the DSS undefined value"""
+    return ~np.isnan(a) & (a != UNDEFINED)
+
+
+def _interp(x, xp, fp, method):
+    """interpolates x in the increasing table xp -> fp; NaN outside the table or where x is undefined"""
+    y = np.full(x.shape, np.nan)
+    if len(xp) == 0:
+        return y
+    ok = _defined(x) & (x >= xp[0]) & (x <= xp[-1])
+    if method == "linear":
+        y[ok] = np.interp(x[ok], xp, fp)
+    elif method == "log":
+        if np.any(xp <= 0) or np.any(fp <= 0):
+            raise ValueError("log interpolation needs positive ordinates and values")
+        y[ok] = np.exp(np.interp(np.log(x[ok]), np.log(xp), np.log(fp)))
+    else:
+        raise ValueError(f"unknown interpolation method '{method}', use 'linear' or 'log'")
+    return y
+
 
 class PairedData:
     def __init__(self):
@@ -27,6 +54,84 @@ class PairedData:
         """
         return len(self.values)
 
+    def interpolate(self, x, curve=0, method="linear", path=None):
+        """
+        Look up values of a curve at x (for a rating, flow from stage).
+
+        Parameters:
+        x (float, array or time series): independent values. A RegularTimeSeries or
+            IrregularTimeSeries is converted as a whole and a copy is returned.
+        curve (int or str, optional): curve index or label. None evaluates every curve and
+            adds a last axis of one column per curve. Defaults to 0.
+        method (str, optional): 'linear', or 'log' for straight lines in log-log space. Defaults to 'linear'.
+        path (str, optional): pathname of a returned time series. Defaults to None (no pathname).
+
+        Returns:
+        float, numpy.ndarray or time series: interpolated values, a float for a scalar x and a single
+        curve. NaN and undefined inputs, and inputs outside the curve, give NaN (the DSS undefined
+        value for a time series). A time series keeps its times, with INST-VAL data for
+        instantaneous input and PER-AVER otherwise.
+        """
+        return self._evaluate(x, curve, method, False, path)
+
+    def inverse_interpolate(self, y, curve=0, method="linear", path=None):
+        """
+        Look up the independent values at which a curve reaches y (for a rating, stage from flow).
+
+        The curve must be monotonic. Parameters and return value are as for :meth:`interpolate`.
+        """
+        return self._evaluate(y, curve, method, True, path)
+
+    def _curve_index(self, curve):
+        if isinstance(curve, str):
+            if curve not in self.labels:
+                raise ValueError(f"no curve labeled '{curve}'")
+            return self.labels.index(curve)
+        return curve
+
+    def _table(self, curve, inverse):
+        """returns the defined points of one curve, sorted by increasing lookup value"""
+        values = np.asarray(self.values, dtype=np.float64)
+        if values.ndim == 1:
+            values = values.reshape(-1, 1)
+        xp = np.asarray(self.ordinates, dtype=np.float64)
+        fp = values[:, curve]
+        if inverse:
+            xp, fp = fp, xp
+        keep = _defined(xp) & _defined(fp)
+        xp, fp = xp[keep], fp[keep]
+        if len(xp) > 1 and xp[0] > xp[-1]:
+            xp, fp = xp[::-1], fp[::-1]
+        if np.any(np.diff(xp) < 0):
+            raise ValueError(f"curve {curve} is not monotonic")
+        return xp, fp
+
+    def _evaluate(self, x, curve, method, inverse, path):
+        series = x if hasattr(x, "values") and hasattr(x, "times") else None
+        if series is not None and curve is None:
+            raise ValueError("a time series can only be converted with a single curve")
+        x = np.asarray(series.values if series is not None else x, dtype=np.float64)
+        values = np.asarray(self.values)
+        curves = [self._curve_index(curve)] if curve is not None else range(values.shape[1] if values.ndim > 1 else 1)
+        result = np.empty(x.shape + (len(curves),))
+        for k, c in enumerate(curves):
+            xp, fp = self._table(c, inverse)
+            result[..., k] = _interp(x, xp, fp, method)
+        if curve is not None:
+            result = result[..., 0]
+        if series is None:
+            return float(result) if result.ndim == 0 else result
+        ts = copy.copy(series)
+        # the times and quality are copied, so the new series can be changed on its own
+        ts.times = series.times64.copy()
+        ts.quality = copy.copy(series.quality)
+        ts.id = path
+        ts.values = np.where(np.isnan(result), UNDEFINED, result)
+        ts.units = self.units_independent if inverse else self.units_dependent
+        instantaneous = str(series.data_type).upper().startswith("INST")
+        ts.data_type = str(DssType.INST_VAL) if instantaneous else str(DssType.PER_AVER)
+        return ts
+
     # def to_data_frame(self, include_index=False):
     #     """
     #     Convert the paired data to a pandas DataFrame.
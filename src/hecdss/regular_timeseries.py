@@ -10,7 +10,8 @@ class RegularTimeSeries:
         """
         Initializes a new instance of the RegularTimeSeries class.
         """
-        self.times = []
+        self._times = []
+        self._times64 = None
         self.values = np.empty(0)
         self.quality = []
         self.units = ""
@@ -23,6 +24,46 @@ class RegularTimeSeries:
         self.id = ""
         self.location_info = None
 
+    @property
+    def times(self):
+        """
+        list of datetime for each value.
+
+        When the series was read with datetime64 times the list is built
+        on first access (with the time zone applied) and kept from then on.
+        """
+        if self._times is None:
+            tz = ZoneInfo(self.time_zone_name) if self.time_zone_name else None
+            self._times = DateConverter.date_times_from_datetime64(self._times64, tz)
+            self._times64 = None
+        return self._times
+
+    @times.setter
+    def times(self, value):
+        if isinstance(value, np.ndarray) and np.issubdtype(value.dtype, np.datetime64):
+            self._times = None
+            self._times64 = value.astype("datetime64[s]", copy=False)
+        else:
+            self._times = value
+            self._times64 = None
+
+    @property
+    def times64(self):
+        """
+        times as a numpy datetime64[s] array (wall clock time, no time zone)
+        """
+        if self._times is None:
+            return self._times64
+        return DateConverter.datetime64_from_date_times(self._times)
+
+    def _get_first_time(self):
+        """
+        Returns the first time as a datetime without building the full times list.
+        """
+        if self._times is None:
+            return self._times64[0].item()
+        return self._times[0]
+
     def add_data_point(self, date, value, flag=None):
         """
         Adds a data point to the time series.
@@ -78,7 +119,9 @@ class RegularTimeSeries:
         Returns:
             int: The number of data points in the time series.
         """
-        return len(self.times)
+        if self._times is None:
+            return len(self._times64)
+        return len(self._times)
 
     def print_to_console(self):
         """
@@ -123,13 +166,17 @@ class RegularTimeSeries:
         Returns:
             int: The interval in seconds, or "empty" if there are fewer than two dates.
         """
-        if len(self.times) > 1 and type(self.times[0]) == datetime:
-            interval = self.times[1]-self.times[0]
-            total_seconds = interval.total_seconds()
-            if total_seconds > 86400:
+        if self._times is None:
+            if len(self._times64) < 2:
                 return "empty"
-            return int(interval.total_seconds())
-        return "empty"
+            total_seconds = (self._times64[1] - self._times64[0]) / np.timedelta64(1, "s")
+        elif len(self._times) > 1 and type(self._times[0]) == datetime:
+            total_seconds = (self._times[1] - self._times[0]).total_seconds()
+        else:
+            return "empty"
+        if total_seconds > 86400:
+            return "empty"
+        return int(total_seconds)
 
     def _interval_to_interval(self, new_interval):
         """
@@ -169,8 +216,13 @@ class RegularTimeSeries:
                 # --------------------- #
                 # non-calendar interval #
                 # --------------------- #
-                span = timedelta(seconds=new_interval)
-                self.times = [(first_time + i * span) for i in range(count)]
+                if self._times is None:
+                    # keep datetime64 storage; time zone is applied when times are materialized
+                    first64 = np.datetime64(first_time.replace(tzinfo=None), "s")
+                    self.times = first64 + np.arange(count) * np.timedelta64(new_interval, "s")
+                else:
+                    span = timedelta(seconds=new_interval)
+                    self.times = [(first_time + i * span) for i in range(count)]
             elif new_interval == 864000:
                 # ------------------ #
                 # Tri-Month interval #
@@ -213,8 +265,8 @@ class RegularTimeSeries:
         """
         Generates times for the time series based on the interval and start date.
         """
-        if(len(self.times) > 0 and self.start_date == ""):
-            self.start_date = self.times[0]
+        if(self.get_length() > 0 and self.start_date == ""):
+            self.start_date = self._get_first_time()
 
         x = [self._get_interval_times(), self._get_interval_path(), self._get_interval_interval()]
         x = [i for i in x if i != "empty"]
@@ -232,7 +284,7 @@ class RegularTimeSeries:
 
         Args:
             values (list): List of data values.
-            times (list, optional): List of time values. Defaults to [].
+            times (list, optional): List of time values, or a numpy datetime64 array. Defaults to [].
             quality (list, optional): List of quality values. Defaults to [].
             units (str, optional): Units of the data. Defaults to "".
             data_type (str, optional): Type of the data. Defaults to "".
@@ -247,8 +299,11 @@ class RegularTimeSeries:
             RegularTimeSeries: A new instance of the RegularTimeSeries class.
         """
         rts = RegularTimeSeries()
-        rts.times = [i.replace(microsecond=0) for i in times]
-        rts.values = np.array(values)
+        if isinstance(times, np.ndarray) and np.issubdtype(times.dtype, np.datetime64):
+            rts.times = times
+        else:
+            rts.times = [i.replace(microsecond=0) for i in times]
+        rts.values = np.asarray(values)  # arrays are kept, not copied
         rts.quality = quality
         rts.units = units
         rts.data_type = data_type
@@ -62,6 +62,20 @@ class TestArray(unittest.TestCase):
             np.testing.assert_array_equal(b.float_values, c.float_values)
             np.testing.assert_array_equal(b.double_values, c.double_values)
 
+    def test_large_arrays(self):
+        with HecDss(self.test_files.create_test_file(".dss")) as dss:
+            data_path = "/test/large-array/redshift////"
+            a = ArrayContainer.create_array_container(int_values=np.arange(1_000_000, dtype=np.int32),
+                                                      double_values=np.linspace(0.0, 1.0, 2_000_000))
+            a.id = data_path
+            dss.put(a)
+
+            b = dss.get(data_path)
+            self.assertEqual(np.int32, b.int_values.dtype)
+            self.assertEqual(np.float64, b.double_values.dtype)
+            self.assertEqual(0, b.float_values.size)
+            np.testing.assert_array_equal(b.int_values, a.int_values)
+            np.testing.assert_array_equal(b.double_values, a.double_values)
 
 
 if __name__ == "__main__":
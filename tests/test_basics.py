@@ -1,11 +1,19 @@
 """Pytest module."""
 
+import os
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import numpy as np
+
 from file_manager import FileManager
 
-from hecdss import Catalog, HecDss
+from hecdss import Catalog, HecDss, RegularTimeSeries
+from hecdss.hecdss import DSS_UNDEFINED_VALUE
+from hecdss.location_info import LocationInfo
+from hecdss.record_type import RecordType
+from hecdss.text import Text
 
 
 class TestBasics(unittest.TestCase):
@@ -49,6 +57,42 @@ class TestBasics(unittest.TestCase):
             tsc3 = dss.get(tsc.id, t1, t2)
             assert len(tsc3.values) == len(tsc.values)
 
+    def test_get_many(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            pathnames = ["//SACRAMENTO/PRECIP-INC//1Day/OBS/", "//SACRAMENTO/TEMP-MAX//1Day/OBS/"]
+            t1 = datetime(2005, 1, 1)
+            t2 = datetime(2005, 1, 4)
+            dss.reset_native_call_counts()
+            results = dss.get_many(pathnames, t1, t2, with_location=False)
+            # the record types of the batch come from at most one catalog read
+            self.assertLessEqual(dss.get_native_call_counts().get("hec_dss_catalog", 0), 1)
+            self.assertEqual(pathnames, list(results.keys()))
+            for path in pathnames:
+                tsc = dss.get(path, t1, t2)
+                self.assertEqual(list(tsc.values), list(results[path].values))
+                self.assertIsNone(results[path].location_info)
+            times, values = dss.get_many(pathnames, t1, t2, stack=True)
+            self.assertEqual((2, 4), values.shape)
+            self.assertEqual(t1, times[0].item())
+
+    def test_iter_timeseries(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            path = "//SACRAMENTO/PRECIP-INC//1Day/OBS/"
+            t1 = datetime(1878, 6, 1)
+            t2 = datetime(1884, 6, 1)
+            tsc = dss.get(path, t1, t2)
+            chunks = list(dss.iter_timeseries(path, t1, t2, chunk=100))
+            self.assertGreater(len(chunks), 6)
+            times = np.concatenate([t for t, v in chunks])
+            values = np.concatenate([v for t, v in chunks])
+            self.assertTrue(np.array_equal(tsc.times64, times))
+            self.assertTrue(np.array_equal(tsc.values, values))
+            # without chunk, one read per yearly block: part of 1878, 1879 to 1883, part of 1884
+            chunks = list(dss.iter_timeseries(path, t1, t2))
+            self.assertEqual(7, len(chunks))
+            self.assertEqual([1878 + i for i in range(7)], [t[0].item().year for t, v in chunks])
+            self.assertTrue(np.array_equal(tsc.values, np.concatenate([v for t, v in chunks])))
+
     def test_catalog(self):
         with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
             catalog = dss.get_catalog()
@@ -56,11 +100,92 @@ class TestBasics(unittest.TestCase):
                 print(ds.recType, ds)
 
 
+    def test_catalog_pattern(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            catalog = dss.get_catalog("/*/SACRAMENTO/*/*/*/*/")
+            self.assertGreater(len(catalog.uncondensed_paths), 0)
+            self.assertLess(len(catalog.uncondensed_paths), dss.record_count())
+            for path in catalog.uncondensed_paths:
+                self.assertEqual("SACRAMENTO", path.split("/")[2])
+            paths = [str(p) for p in dss.iter_catalog("/*/SACRAMENTO/*/*/*/*/")]
+            self.assertEqual(catalog.uncondensed_paths, paths)
+
+    def test_catalog_broad_pattern(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            dss.reset_native_call_counts()
+            catalog = dss.get_catalog("/*/*/*/*/*/*/")
+            # at most one retry with room for every record, each call scans the file
+            self.assertLessEqual(dss.get_native_call_counts()["hec_dss_catalog"], 2)
+            self.assertEqual(dss.get_catalog().uncondensed_paths, catalog.uncondensed_paths)
+
+    def test_catalog_cache(self):
+        filename = self.test_files.get_copy("sample7.dss")
+        with HecDss(filename) as dss:
+            catalog = dss.get_catalog(cache=True)
+            self.assertTrue(os.path.isfile(filename + ".catalog.npz"))
+            dss.reset_native_call_counts()
+            cached = dss.get_catalog(cache=True)
+            self.assertNotIn("hec_dss_catalog", dss.get_native_call_counts())
+            self.assertEqual([str(p) for p in catalog.items], [str(p) for p in cached.items])
+            self.assertEqual(catalog.uncondensed_paths, cached.uncondensed_paths)
+            # a write changes the file, so the cache is rebuilt
+            dss.put(Text.create("/CACHE/TEST/TEXT////", "text"))
+        with HecDss(filename) as dss:
+            dss.reset_native_call_counts()
+            rebuilt = dss.get_catalog(cache=True)
+            self.assertIn("hec_dss_catalog", dss.get_native_call_counts())
+            self.assertIn("/CACHE/TEST/TEXT////", [str(p) for p in rebuilt.items])
+        # an unchanged file reopened later uses the cache
+        with HecDss(filename) as dss:
+            dss.reset_native_call_counts()
+            reopened = dss.get_catalog(cache=True)
+            self.assertNotIn("hec_dss_catalog", dss.get_native_call_counts())
+            self.assertEqual([str(p) for p in rebuilt.items], [str(p) for p in reopened.items])
+
+    def test_catalog_save_load(self):
+        rawPaths = [
+            "//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/",
+            "//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/",
+            "/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/",
+        ]
+        c = Catalog(rawPaths, [100, 100, 200])
+        filename = self.test_files.create_test_file(".npz")
+        c.save(filename, (1, 2, 3))
+        self.assertIsNone(Catalog.load(filename, (1, 2, 4)))
+        loaded = Catalog.load(filename, (1, 2, 3))
+        self.assertEqual([str(p) for p in c.items], [str(p) for p in loaded.items])
+        self.assertEqual(rawPaths, loaded.uncondensed_paths)
+        self.assertEqual(RecordType.PairedData, loaded.get_record_type("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/"))
+
     def test_catalog_get(self):
         with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
             catalog = dss.get_catalog()
             ts = dss.get(catalog.items[0])
 
+    def test_get_record_type(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            self.assertEqual(RecordType.RegularTimeSeries, dss.get_record_type("//SACRAMENTO/TEMP-MAX//1Day/OBS/"))
+            self.assertEqual(RecordType.PairedData, dss.get_record_type("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/"))
+            with self.assertRaises(KeyError):
+                dss.get_record_type("/NO/SUCH/RECORD///F/")
+            # the time-series type is cached for every D part
+            HecDss.reset_native_call_counts()
+            self.assertEqual(RecordType.RegularTimeSeries,
+                             dss.get_record_type("//SACRAMENTO/TEMP-MAX/01Jan1990/1Day/OBS/"))
+            self.assertEqual({}, HecDss.get_native_call_counts())
+
+    def test_catalog_kept_after_put(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            catalog = dss.get_catalog()
+            dss.put(Text.create("/KEPT/CATALOG/TEXT////", "text"))
+            # the full catalog is updated by the put, not rescanned
+            HecDss.reset_native_call_counts()
+            self.assertEqual(RecordType.Text, dss.get_record_type("/KEPT/CATALOG/TEXT////"))
+            self.assertEqual({}, HecDss.get_native_call_counts())
+            self.assertIn("/KEPT/CATALOG/TEXT////", [str(p) for p in catalog])
+            dss.delete("/KEPT/CATALOG/TEXT////")
+            self.assertNotIn("/KEPT/CATALOG/TEXT////", [str(p) for p in catalog])
+
 
     def test_with_block(self):
 
@@ -83,6 +208,90 @@ class TestBasics(unittest.TestCase):
         c = Catalog(rawPaths, recordType)
         c.print()
 
+    def test_catalog_condense(self):
+        rawPaths = [
+            "//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/",
+            "//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/",
+            "//sacramento/temp-min/01Jan1991/1day/obs/",
+            "/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/",
+            "/grid/EAU/PRECIP/02FEB2020:0600/02FEB2020:0700/SHG/",
+            "//SACRAMENTO/TEMP-MAX/TS-PATTERN/1Day/OBS/",
+        ]
+        recordType = [100, 100, 100, 200, 420, 100]
+        c = Catalog(rawPaths, recordType)
+        paths = [str(p) for p in c.items]
+        self.assertEqual(["/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/",
+                          "/grid/EAU/PRECIP/02FEB2020:0600/02FEB2020:0700/SHG/",
+                          "//sacramento/temp-min/01Jan1989-01Jan1991/1day/obs/"], paths)
+        self.assertEqual([datetime(1989, 1, 1), datetime(1990, 1, 1), datetime(1991, 1, 1)],
+                         c.block_dates("//SACRAMENTO/TEMP-MIN/01Jan1991/1Day/OBS/"))
+        self.assertEqual(RecordType.RegularTimeSeries, c.get_record_type("//SACRAMENTO/TEMP-MAX//1Day/OBS/"))
+        self.assertEqual(RecordType.Grid, c.get_record_type("/GRID/EAU/PRECIP/02FEB2020:0600/02FEB2020:0700/SHG/"))
+        self.assertIn("//sacramento/temp-min//1day/obs/", c.recordTypeDict)
+
+    def test_catalog_find(self):
+        rawPaths = [
+            "//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/",
+            "//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/",
+            "//SACRAMENTO/FLOW/01Jan1990/1Hour/OBS/",
+            "//FOLSOM/FLOW/01Jan1990/1Hour/OBS/",
+            "/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/",
+        ]
+        recordType = [100, 100, 100, 100, 200]
+        c = Catalog(rawPaths, recordType)
+        self.assertEqual(["//SACRAMENTO/FLOW/01Jan1990/1Hour/OBS/"],
+                         [str(p) for p in c.find(B="sacramento", C="FLOW*", E="1Hour")])
+        self.assertEqual(["/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/", "//SACRAMENTO/FLOW/01Jan1990/1Hour/OBS/",
+                          "//FOLSOM/FLOW/01Jan1990/1Hour/OBS/"], [str(p) for p in c.find(C="*FLOW")])
+        self.assertEqual(["//SACRAMENTO/TEMP-MIN/01Jan1989-01Jan1990/1Day/OBS/"], [str(p) for p in c.find(D="01JAN1989")])
+        self.assertEqual([], c.find(B="AMERICAN"))
+        c.notify_put("//AMERICAN/FLOW/01Jan1990/1Hour/OBS/", RecordType.RegularTimeSeries)
+        c.notify_delete("//FOLSOM/FLOW/01Jan1990/1Hour/OBS/")
+        self.assertEqual(["//SACRAMENTO/FLOW/01Jan1990/1Hour/OBS/", "//AMERICAN/FLOW/01Jan1990/1Hour/OBS/"],
+                         [str(p) for p in c.find(C="flow")])
+
+    def test_catalog_from_records(self):
+        records = iter([
+            ("//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/", 100),
+            ("//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/", 100),
+            ("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/", 200),
+        ])
+        c = Catalog.from_records(records)
+        pairs = [(str(a), str(b)) for a in c for b in c]
+        self.assertEqual(4, len(pairs))
+        self.assertEqual(("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/", "//SACRAMENTO/TEMP-MIN/01Jan1989-01Jan1990/1Day/OBS/"), pairs[1])
+        self.assertEqual("//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/", c.uncondensed_paths[1])
+        self.assertEqual([100, 100, 200], list(c.rawRecordTypes))
+
+    def test_catalog_notify(self):
+        rawPaths = [
+            "//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/",
+            "//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/",
+            "/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/",
+        ]
+        recordType = [100, 100, 200]
+        c = Catalog(rawPaths, recordType)
+        self.assertEqual(2, len(c.items))
+
+        c.notify_put("//SACRAMENTO/TEMP-MIN/01Jan1991/1Day/OBS/", RecordType.RegularTimeSeries)
+        c.notify_put("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS-modified/", RecordType.PairedData)
+        paths = [str(p) for p in c.items]
+        self.assertIn("//SACRAMENTO/TEMP-MIN/01Jan1989-01Jan1991/1Day/OBS/", paths)
+        self.assertIn("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS-modified/", paths)
+        self.assertEqual(RecordType.PairedData, c.get_record_type("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS-modified/"))
+
+        c.notify_delete("//SACRAMENTO/TEMP-MIN/01Jan1991/1Day/OBS/")
+        c.notify_delete("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/")
+        paths = [str(p) for p in c.items]
+        self.assertIn("//SACRAMENTO/TEMP-MIN/01Jan1989-01Jan1990/1Day/OBS/", paths)
+        self.assertNotIn("/MY BASIN/DEER CREEK/STAGE-FLOW///USGS/", paths)
+
+        c.notify_delete("//SACRAMENTO/TEMP-MIN/01Jan1989/1Day/OBS/")
+        c.notify_delete("//SACRAMENTO/TEMP-MIN/01Jan1990/1Day/OBS/")
+        self.assertEqual(["/MY BASIN/DEER CREEK/STAGE-FLOW///USGS-modified/"], [str(p) for p in c.items])
+        with self.assertRaises(KeyError):
+            c.get_record_type("//SACRAMENTO/TEMP-MIN//1Day/OBS/")
+
 
     def test_paired_data(self):
         """
@@ -118,6 +327,24 @@ class TestBasics(unittest.TestCase):
             tsc.print_to_console()
             self.assertEqual(4, len(tsc.values))
 
+    def test_catalog_blocks_after_put(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            catalog = dss.get_catalog()
+            times = np.arange(np.datetime64("1989-12-30"), np.datetime64("1991-01-03"), np.timedelta64(1, "D"))
+            values = np.arange(len(times), dtype=np.float64)
+            values[-2:] = DSS_UNDEFINED_VALUE
+            ts = RegularTimeSeries.create(values, times=times, units="CFS", data_type="INST-VAL",
+                                          path="//BLOCKS/FLOW//1Day/PUT/")
+            # the blocks are worked out from the times written, without a catalog scan
+            HecDss.reset_native_call_counts()
+            self.assertEqual(0, dss.put(ts))
+            self.assertNotIn("hec_dss_catalog", HecDss.get_native_call_counts())
+            # 01Jan1991 00:00 ends 1990, the all-missing 1991 block is not written
+            self.assertEqual([datetime(1989, 1, 1), datetime(1990, 1, 1)],
+                             catalog.block_dates("//BLOCKS/FLOW//1Day/PUT/"))
+            self.assertEqual(catalog.block_dates("//BLOCKS/FLOW//1Day/PUT/"),
+                             dss.get_catalog().block_dates("//BLOCKS/FLOW//1Day/PUT/"))
+
     def test_missing_values(self):
         with HecDss(self.test_files.get_copy("missing_data.dss")) as dss:
             print("record count = " + str(dss.record_count()))
@@ -223,6 +450,53 @@ class TestBasics(unittest.TestCase):
             tsc2 = dss.get(tsc.id)
             assert(len(tsc2.values) > 0)
 
+    def test_native_call_counts(self):
+        HecDss.reset_native_call_counts()
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            dss.record_count()
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            dss.record_count()
+        counts = HecDss.get_native_call_counts()
+        self.assertEqual(2, counts["hec_dss_open"])
+        self.assertEqual(2, counts["hec_dss_record_count"])
+        self.assertEqual(2, counts["hec_dss_close"])
+
+    def test_native_call_counts_threads(self):
+        files = [self.test_files.get_copy("sample7.dss") for i in range(4)]
+
+        def count_records(filename):
+            with HecDss(filename) as dss:
+                for i in range(1000):
+                    dss.record_count()
+
+        HecDss.reset_native_call_counts()
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(count_records, files))
+        self.assertEqual(4000, HecDss.get_native_call_counts()["hec_dss_record_count"])
+
+    def test_location_info_cache(self):
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            path = "//CACHE/FLOW//1Day/LOCATION/"
+            location = LocationInfo.create([1.0], [2.0], [3.0], 0, 0, 0, 0, 0, 0, "", "", path=path)
+            ts = RegularTimeSeries.create([1.0, 2.0, 3.0], times=[datetime(2005, 1, d) for d in (1, 2, 3)],
+                                          units="CFS", data_type="INST-VAL", path=path, location_info=location)
+            self.assertEqual(0, dss.put(ts))
+            HecDss.reset_native_call_counts()
+            tsc = dss.get(path)
+            tsc2 = dss.get(path)
+            self.assertEqual(1, HecDss.get_native_call_counts()["hec_dss_locationRetrieve"])
+            self.assertEqual(1.0, tsc.location_info.x[0])
+            self.assertIsNot(tsc.location_info, tsc2.location_info)
+            tsc3 = dss.get(path, with_location=False)
+            self.assertIsNone(tsc3.location_info)
+            self.assertEqual(1, HecDss.get_native_call_counts()["hec_dss_locationRetrieve"])
+            # a delete drops the cached location, so it is read again after the path is rewritten
+            dss.delete(path, allrecords=True)
+            ts.location_info = None
+            self.assertEqual(0, dss.put(ts))
+            dss.get(path)
+            self.assertEqual(2, HecDss.get_native_call_counts()["hec_dss_locationRetrieve"])
+
     def test_path_empty_parts(self):
         with HecDss(self.test_files.get_copy("Depth_Area_01.dss")) as dss:
             path = "//010020-R/STORAGE-FLOW///DAA:Depth-Area 01>010025-R/"
@@ -6,7 +6,9 @@ import numpy as np
 from file_manager import FileManager
 
 from hecdss import HecDss
-from hecdss.gridded_data import GriddedData
+from hecdss.gridded_data import NULL_INT, GriddedData
+from hecdss.hecdss import DSS_UNDEFINED_VALUE
+from hecdss.location_info import LocationInfo
 
 
 class TestGriddedData(unittest.TestCase):
@@ -26,6 +28,9 @@ class TestGriddedData(unittest.TestCase):
             gd = dss.get(path)
             assert (gd.numberOfCellsX == 21), f"gd.numberOfCellsX should be 50. is {gd.numberOfCellsX}"
             assert (gd.numberOfCellsY == 28), f"gd.numberOfCellsY should be 50. is {gd.numberOfCellsY}"
+            # cells are returned as stored, in single precision
+            self.assertEqual(np.float32, gd.data.dtype)
+            self.assertEqual((28, 21), gd.data.shape)
 
     def test_is_gridded_data_type(self):
         """
@@ -36,6 +41,55 @@ class TestGriddedData(unittest.TestCase):
             gd = dss.get(path)
             assert (type(gd) is GriddedData), f"gd should be type GriddedData. is {type(gd)}"
 
+    def test_gridded_data_range_limit_table(self):
+        """
+        exceedance counts match a direct comparison of every cell with every limit
+        """
+        rng = np.random.default_rng(0)
+        data = rng.normal(size=(60, 40)).astype(np.float32)
+        data[::7, ::3] = np.nan
+        gd = GriddedData.create(data=data)
+        flat = gd.data.ravel()
+        expected = (flat[None, :] >= np.asarray(gd.rangeLimitTable)[:, None]).sum(axis=1)
+        self.assertTrue(np.array_equal(expected, gd.numberEqualOrExceedingRangeLimit))
+
+    def test_gridded_data_window(self):
+        """
+        cut a cell window and a bounding box out of a grid
+        """
+        data = [[j + (50 * i) for j in range(50)] for i in range(40)]
+        gd = GriddedData.create(data=data, lowerLeftCellX=100, lowerLeftCellY=200, cellSize=2000.0)
+        w = gd.window(110, 205, 120, 215)
+        self.assertEqual((110, 205), (w.lowerLeftCellX, w.lowerLeftCellY))
+        self.assertEqual((10, 10), (w.numberOfCellsX, w.numberOfCellsY))
+        self.assertTrue(np.array_equal(np.array(data)[5:15, 10:20], w.data))
+        self.assertEqual(14 * 50 + 19, w.maxDataValue)
+        self.assertFalse(np.shares_memory(w.data, gd.data))
+        # bounding box in map coordinates, clipped to the grid
+        cells = gd.bbox_to_cells(110 * 2000.0, 205 * 2000.0, 120 * 2000.0 - 1, 215 * 2000.0 - 1)
+        self.assertEqual((110, 205, 120, 215), cells)
+        clipped = gd.window(140, 230, 1000, 1000)
+        self.assertEqual((10, 10), clipped.data.shape[::-1])
+        with self.assertRaises(ValueError):
+            gd.window(0, 0, 10, 10)
+
+    def test_gridded_data_window_undefined_cells(self):
+        """
+        window statistics skip NaN and NULL_INT cells, and a window without defined cells still works
+        """
+        data = np.arange(100, dtype=np.float32).reshape(10, 10)
+        data[:, :5] = np.nan
+        data[:, 5] = NULL_INT
+        gd = GriddedData.create(data=data, lowerLeftCellX=0, lowerLeftCellY=0)
+        w = gd.window(4, 0, 8, 10)
+        self.assertEqual(6, w.minDataValue)
+        self.assertEqual(97, w.maxDataValue)
+        self.assertAlmostEqual(np.mean(data[:, 6:8]), w.meanDataValue, places=4)
+        empty = gd.window(0, 0, 6, 10)
+        self.assertEqual(NULL_INT, empty.maxDataValue)
+        self.assertEqual(NULL_INT, empty.minDataValue)
+        self.assertEqual(NULL_INT, empty.meanDataValue)
+
     def test_gridded_data_create(self):
         """
         Generates a GriddedData object
@@ -126,5 +180,146 @@ class TestGriddedData(unittest.TestCase):
             assert gd_original.dataUnits == gd_readback.dataUnits, "dataUnits mismatch"
 
 
+    def test_put_grids(self):
+        """
+        compress several grids on worker threads and store them in order
+        """
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            stack = dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/")
+            grids = [dss.get(p) for p in stack.pathnames[:4]]
+            for gd in grids:
+                gd.id = gd.id.replace("/SHG-SNODAS/", "/SHG-SNODAS-POOL/")
+            grids[-1].location_info = LocationInfo.create([1.0], [2.0], [3.0], 0, 0, 0, 0, 0, 0, "", "", path=grids[-1].id)
+            statuses = dss.put_grids(iter(grids), max_workers=2, max_pending=2)
+            self.assertEqual([0, 0, 0, 0], statuses)
+            for gd in grids:
+                readback = dss.get(gd.id)
+                self.assertTrue(np.array_equal(gd.data, readback.data))
+                self.assertEqual(gd.maxDataValue, readback.maxDataValue)
+            # the location info is stored with the grid, and the cached one is replaced
+            location = dss.get(grids[-1].id).location_info
+            self.assertEqual([1.0, 2.0, 3.0], [location.x[0], location.y[0], location.z[0]])
+
+    def test_get_grid_into_buffer(self):
+        """
+        read a grid into a caller provided float32 buffer, and compare with dss.get()
+        """
+        path = "/grid/EAU GALLA RIVER/SNOW MELT/02FEB2020:0600/03FEB2020:0600/SHG-SNODAS/"
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            gd = dss.get(path)
+            buffer = np.empty(21 * 28, dtype=np.float32)
+            HecDss.reset_native_call_counts()
+            gd2 = dss.get_grid(path, out=buffer, with_location=False)
+            self.assertEqual(1, HecDss.get_native_call_counts()["hec_dss_gridRetrieve"])
+            self.assertTrue(np.shares_memory(gd2.data, buffer))
+            self.assertEqual((28, 21), gd2.data.shape)
+            self.assertTrue(np.array_equal(gd.data, gd2.data))
+            with self.assertRaises(ValueError):
+                dss.get_grid(path, out=np.empty(10, dtype=np.float32))
+
+    def test_get_grid_window(self):
+        """
+        a windowed read returns a copy of the window, not a view of a full grid buffer
+        """
+        path = "/grid/EAU GALLA RIVER/SNOW MELT/02FEB2020:0600/03FEB2020:0600/SHG-SNODAS/"
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            gd = dss.get(path)
+            x, y = gd.lowerLeftCellX, gd.lowerLeftCellY
+            w = dss.get_grid(path, with_location=False, window=(x + 2, y + 3, x + 7, y + 9))
+            self.assertEqual((6, 5), w.data.shape)
+            self.assertTrue(np.array_equal(gd.data[3:9, 2:7], w.data))
+            self.assertIsNone(w.data.base)
+            with self.assertRaises(ValueError):
+                dss.get_grid(path, out=np.empty(10, dtype=np.float32), window=(x, y, x + 1, y + 1))
+
+
+    def test_get_grid_stack(self):
+        """
+        read all grids of a series into one (time, y, x) array
+        """
+        path = "/grid/EAU GALLA RIVER/SNOW MELT/02FEB2020:0600/03FEB2020:0600/SHG-SNODAS/"
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            gd = dss.get(path)
+            stack = dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/")
+            self.assertGreater(len(stack), 0)
+            self.assertEqual((len(stack), 28, 21), stack.data.shape)
+            self.assertTrue(np.all(np.diff(stack.times) > np.timedelta64(0, "s")))
+            index = stack.pathnames.index(path)
+            self.assertEqual(np.datetime64("2020-02-02T06:00:00"), stack.times[index])
+            self.assertTrue(np.array_equal(gd.data, stack.get_grid_at(index)))
+            threaded = dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", max_workers=2)
+            self.assertTrue(np.array_equal(stack.data, threaded.data))
+
+    def test_get_grid_stack_misaligned(self):
+        """
+        a grid of the same size but a different lower left cell is not stacked
+        """
+        path = "/grid/EAU GALLA RIVER/SNOW MELT/02FEB2020:0600/03FEB2020:0600/SHG-SNODAS/"
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            gd = dss.get(path)
+            gd.lowerLeftCellX += 1
+            gd.id = "/grid/EAU GALLA RIVER/SNOW MELT/01JAN2030:0600/02JAN2030:0600/SHG-SNODAS/"
+            self.assertEqual(0, dss.put(gd))
+            with self.assertRaises(ValueError):
+                dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/")
+            with self.assertRaises(ValueError):
+                dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", bbox=(-1e12, -1e12, 1e12, 1e12))
+
+    def test_get_grid_cells(self):
+        """
+        gather a few cells from every grid of a series, and store them as time series
+        """
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            stack = dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/")
+            info = stack.info
+            cells = [(info.lowerLeftCellX, info.lowerLeftCellY), (info.lowerLeftCellX + 20, info.lowerLeftCellY + 27)]
+            times, values, _ = dss.get_grid_cells("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", cells=cells)
+            self.assertTrue(np.array_equal(stack.times, times))
+            self.assertEqual((len(stack), 2), values.shape)
+            self.assertTrue(np.array_equal(stack.data[:, 0, 0], values[:, 0]))
+            self.assertTrue(np.array_equal(stack.data[:, 27, 20], values[:, 1]))
+            mask = np.zeros((28, 21), dtype=bool)
+            mask[3, 4] = True
+            _, values, cells = dss.get_grid_cells("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", mask=mask,
+                                                  pathnames=["//CELL/SNOW MELT//1Day/SHG-SNODAS/"])
+            self.assertEqual([[info.lowerLeftCellX + 4, info.lowerLeftCellY + 3]], cells.tolist())
+            self.assertTrue(np.array_equal(stack.data[:, 3, 4], values[:, 0]))
+            with self.assertRaises(ValueError):
+                dss.get_grid_cells("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", cells=[(0, 0)])
+
+    def test_get_grid_cells_missing_grid(self):
+        """
+        a grid missing from the series is stored as an undefined value, keeping later values in place
+        """
+        with HecDss(self.test_files.get_copy("grid-example.dss")) as dss:
+            stack = dss.get_grid_stack("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/")
+            self.assertGreater(len(stack), 2)
+            dss.delete(stack.pathnames[1])
+            mask = np.zeros((28, 21), dtype=bool)
+            mask[3, 4] = True
+            times, values, _ = dss.get_grid_cells("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", mask=mask,
+                                                  pathnames=["//CELL/SNOW MELT//1Day/SHG-SNODAS/"])
+            self.assertEqual(len(stack) - 1, len(times))
+            start = stack.end_times[0].astype(object)
+            end = stack.end_times[-1].astype(object)
+            ts = dss.get("//CELL/SNOW MELT//1Day/SHG-SNODAS/", start, end)
+            self.assertEqual(len(stack), len(ts.values))
+            self.assertEqual(DSS_UNDEFINED_VALUE, ts.values[1])
+            self.assertTrue(np.allclose(stack.data[2:, 3, 4], ts.values[2:]))
+            with self.assertRaises(ValueError):
+                dss.get_grid_cells("/grid/EAU GALLA RIVER/SNOW MELT///SHG-SNODAS/", mask=mask,
+                                   pathnames=["//CELL/SNOW MELT//1Week/SHG-SNODAS/"])
+
+    def test_gridded_data_cells_in_polygon(self):
+        """
+        find the cells whose centers are inside a polygon
+        """
+        gd = GriddedData.create(data=np.zeros((10, 10)), lowerLeftCellX=100, lowerLeftCellY=200, cellSize=10.0)
+        square = [(1020, 2030), (1040, 2030), (1040, 2050), (1020, 2050)]
+        self.assertEqual([[102, 203], [103, 203], [102, 204], [103, 204]], gd.cells_in_polygon(square).tolist())
+        triangle = [(1000, 2000), (1100, 2000), (1000, 2100)]
+        self.assertEqual(45, len(gd.cells_in_polygon(triangle)))
+
+
 if __name__ == "__main__":
     unittest.main()
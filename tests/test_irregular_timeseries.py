@@ -9,6 +9,8 @@ import numpy as np
 from file_manager import FileManager
 
 from hecdss import HecDss
+from hecdss.dateconverter import DateConverter
+from hecdss.hecdss import DSS_UNDEFINED_VALUE
 from hecdss.irregular_timeseries import IrregularTimeSeries
 
 
@@ -169,5 +171,45 @@ class TestRegularTimeSeries(unittest.TestCase):
                                                           f" irts.interval is {irts.interval}, irts_modified.interval is {irts_modified.interval}"
 
 
+    def test_irregular_timeseries_julian_times(self):
+        """
+        vectorized julian times used by put() match the datetime list conversion
+        """
+        dates = [datetime(2023, 5, 1, 6) + (i * timedelta(minutes=97)) for i in range(50)]
+        irts = IrregularTimeSeries.create(times=dates, values=list(range(50)), data_type="INST-VAL",
+                                          path="/A/B/FLOW//IR-Day/F/")
+        start_date_base = datetime(1900, 1, 1) + timedelta(days=irts.julian_base_date)
+        for granularity in [1, 60, 3600]:
+            expected = DateConverter.julian_array_from_date_times(dates, granularity, start_date_base)
+            actual = DateConverter.julian_array_from_datetime64(irts.times64, granularity, start_date_base)
+            self.assertEqual(expected, actual.tolist())
+
+    def test_irregular_timeseries_store_as_float(self):
+        file = "examples-all-data-types.dss"
+        with HecDss(self.test_files.get_copy(file)) as dss:
+            irpath = "/irregular-time-series/GAPT/FLOW//IR-Day/forecast-float/"
+            dates = [datetime(2023, 5, 1) + (i * timedelta(hours=2)) for i in range(15)]
+            irts = IrregularTimeSeries.create(times=dates, values=np.arange(15) + 0.5, data_type="INST-VAL", path=irpath)
+            dss.put(irts, save_as_float=True)
+            read_irts = dss.get(irpath)
+        self.assertEqual(irts.times, read_irts.times)
+        self.assertTrue(np.array_equal(irts.values, read_irts.values))
+
+    def test_irregular_timeseries_undefined_values(self):
+        """
+        undefined values are dropped on read, with their times and quality
+        """
+        irpath = "/A/UNDEFINED/FLOW//IR-Day/F/"
+        u = DSS_UNDEFINED_VALUE
+        dates = [datetime(2023, 5, 1) + (i * timedelta(hours=2)) for i in range(6)]
+        with HecDss(self.test_files.create_test_file(".dss")) as dss:
+            irts = IrregularTimeSeries.create(times=dates, values=[u, 1.0, 2.0, u, 4.0, u], data_type="INST-VAL",
+                                              path=irpath)
+            dss.put(irts)
+            read_irts = dss.get(irpath)
+        self.assertEqual([dates[1], dates[2], dates[4]], read_irts.times)
+        self.assertEqual([1.0, 2.0, 4.0], list(read_irts.values))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -2,12 +2,14 @@
 
 import copy
 import unittest
+from datetime import datetime
 
 import numpy as np
 from file_manager import FileManager
 
 from hecdss import HecDss
 from hecdss.paired_data import PairedData
+from hecdss.regular_timeseries import RegularTimeSeries
 
 
 # update MODIFIED_TEST_DIR to be the path the folder containing dss files
@@ -64,6 +66,34 @@ class TestPairedData(unittest.TestCase):
         assert (len(pd.ordinates) == 5), f"len(pd.ordinates) should be 5. is {len(pd.ordinates)}"
         assert (pd.labels[1] == "x plus 1"), f"pd.labels[1] should be 'x plus 1'. is {pd.labels[1]}"
 
+    def test_paired_data_interpolate(self):
+        """
+        look up a family of curves, forward and inverse
+        """
+        pd = PairedData.create([1.0, 2.0, 4.0, 8.0], [[10, 20], [20, 40], [40, 80], [80, np.nan]], labels=["low", "high"])
+        x = np.array([1.5, 3.0, 8.0, 9.0, np.nan, -3.4028234663852886e+38])
+        self.assertTrue(np.allclose([15, 30, 80, np.nan, np.nan, np.nan], pd.interpolate(x), equal_nan=True))
+        both = pd.interpolate([3.0, 8.0], curve=None)
+        self.assertTrue(np.allclose([[30, 60], [80, np.nan]], both, equal_nan=True))
+        self.assertAlmostEqual(60.0, pd.interpolate(3.0, curve="high", method="log"))
+        self.assertTrue(np.allclose([1.5, 6.0], pd.inverse_interpolate([15.0, 60.0])))
+        self.assertIs(float, type(pd.interpolate(3.0)))
+        rts = RegularTimeSeries.create([1.0, 5.0, 100.0], times=[datetime(2020, 1, 1, h) for h in (1, 2, 3)],
+                                       data_type="INST-VAL", path="//GAGE/STAGE//1Hour/OBS/")
+        flow = pd.interpolate(rts)
+        self.assertTrue(np.array_equal([10.0, 50.0, -3.4028234663852886e+38], flow.values))
+        self.assertTrue(np.array_equal([1.0, 5.0, 100.0], rts.values))
+        self.assertIsNone(flow.id)
+        self.assertEqual("INST-VAL", flow.data_type)
+        flow.times.append(datetime(2020, 1, 1, 4))
+        self.assertEqual(3, len(rts.times))
+        rts.data_type = "PER-CUM"
+        flow = pd.interpolate(rts, path="//GAGE/FLOW//1Hour/OBS/")
+        self.assertEqual("//GAGE/FLOW//1Hour/OBS/", flow.id)
+        self.assertEqual("PER-AVER", flow.data_type)
+        with self.assertRaises(ValueError):
+            pd.interpolate(rts, curve=None)
+
     def test_paired_data_create_store(self):
         """
         Generates a PairedData object then stores data on disk
@@ -148,6 +178,20 @@ class TestPairedData(unittest.TestCase):
         assert (pd3.labels[3] == "New Label"), f"pd3.labels[3] is not equal to 'New Label'. pd3.labels[3] is {pd3.labels[3]}"
         assert (np.array_equal(pd.ordinates, pd3.ordinates)), f"pd.ordinates contents is not equal to that of pd2.ordinates. pd is {pd.ordinates} and pd2 is {pd3.ordinates}"
 
+    def test_paired_data_read_curve_layout(self):
+        """
+        many curves are read as an (ordinates, curves) array, one column per curve
+        """
+        with HecDss(self.test_files.get_copy("sample7.dss")) as dss:
+            x_values = [1.0, 2.0, 3.0, 4.0]
+            y_values = [[x * 10 + c for c in range(5)] for x in x_values]
+            path = "/MY BASIN/DEER CREEK/STAGE-FLOW///USGS-curves/"
+            dss.put(PairedData.create(x_values, y_values, labels=[f"c{c}" for c in range(5)], path=path))
+            pd = dss.get(path)
+        self.assertEqual((4, 5), pd.values.shape)
+        self.assertTrue(np.array_equal([40, 41, 42, 43, 44], pd.values[3]))
+        self.assertTrue(np.array_equal([2, 12, 22, 32, 42], pd.values[:, 2]))
+
 
 if __name__ == "__main__":
     unittest.main()
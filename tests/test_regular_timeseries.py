@@ -7,6 +7,8 @@ import numpy as np
 from file_manager import FileManager
 
 from hecdss import HecDss
+from hecdss.dateconverter import DateConverter
+from hecdss.hecdss import DSS_UNDEFINED_VALUE
 from hecdss.regular_timeseries import RegularTimeSeries
 
 
@@ -56,6 +58,21 @@ class TestRegularTimeSeries(unittest.TestCase):
         rts = RegularTimeSeries.create(range(15), times=times, path=path)
         self.assertEqual("//EAU GALLA RIVER/Flow//10Second//", rts.id)
 
+    def test_regular_timeseries_create_datetime64(self):
+        """
+        create regular timeseries from datetime64 times; datetime list is built on demand
+        """
+        julian = np.arange(1, 25) * 60  # minutes
+        times64 = DateConverter.datetime64_from_julian_array(julian, 60, 45000)
+        expected = DateConverter.date_times_from_julian_array(julian.tolist(), 60, 45000)
+        rts = RegularTimeSeries.create(range(24), times=times64, path="//EAU GALLA RIVER/Flow//1Hour//")
+        self.assertEqual(3600, rts.interval)
+        self.assertEqual(24, rts.get_length())
+        self.assertEqual(expected[0], rts.start_date)
+        self.assertIsNone(rts._times)
+        self.assertEqual(expected, rts.times)
+        self.assertTrue(np.array_equal(times64, rts.times64))
+
     def test_regular_timeseries_create_fail(self):
         """
         create regular timerseries
@@ -196,6 +213,33 @@ class TestRegularTimeSeries(unittest.TestCase):
             expected_count = 252273
             assert ts.get_length() == expected_count, f" expected {expected_count} values, found {ts.get_length()}"
 
+    def test_regular_timeseries_create_keeps_array(self):
+        """ create() keeps a float64 values array instead of copying it """
+        values = np.arange(5, dtype=np.float64)
+        times = np.arange(np.datetime64("2021-01-02"), np.datetime64("2021-01-07"), np.timedelta64(1, "D"))
+        rts = RegularTimeSeries.create(values, times=times, path="/A/B/FLOW//1Day/F/")
+        self.assertIs(values, rts.values)
+
+    def test_regular_timeseries_trim(self):
+        """ undefined values at the ends are trimmed, those inside are kept """
+        pathname = "/A/TRIM/FLOW//1Day/F/"
+        filename = self.test_files.create_test_file(".dss")
+        u = DSS_UNDEFINED_VALUE
+        times = [datetime(2021, 1, 2) + timedelta(days=i) for i in range(10)]
+        with HecDss(filename) as dss:
+            rts = RegularTimeSeries.create([u, u, 2.0, 3.0, u, 5.0, 6.0, u, u, u], times=times,
+                                           units="cfs", data_type="INST-VAL", path=pathname)
+            dss.put(rts)
+            ts = dss.get(pathname, times[0], times[-1])
+            self.assertEqual(times, ts.times)
+            ts = dss.get(pathname, times[0], times[-1], trim=True)
+            self.assertEqual(times[2:7], ts.times)
+            self.assertEqual([2.0, 3.0, u, 5.0, 6.0], list(ts.values))
+            # without a time window the series is always trimmed
+            ts = dss.get(pathname)
+            self.assertEqual(times[2:7], ts.times)
+            self.assertEqual([2.0, 3.0, u, 5.0, 6.0], list(ts.values))
+
     def test_regular_timeseries_timezone(self):
         """ test reading time-series with timezone information """
         pathname = "/regular-time-series/GAPT/FLOW/01Sep2021 - 31Oct2021/6Hour/forecast1/"
@@ -27,6 +27,38 @@ class TestText(unittest.TestCase):
             txt = dss.get(path)
             self.assertEqual(test_txt.text, txt.text)
 
+    def test_large_text(self):
+        filename = self.test_files.get_copy("TestAlt1-dss-v7.dss")
+        path = "/A/B/C/D/E/large/"
+        text = "".join(f"line {i} of a large text record\n" for i in range(100000))
+        with HecDss(filename) as dss:
+            dss.put(Text.create(path, text))
+            # the size written is remembered, so this is a single read, even above TEXT_MAX_SIZE
+            dss.reset_native_call_counts()
+            self.assertEqual(text, dss.get(path).text)
+            self.assertEqual(1, dss.get_native_call_counts().get("hec_dss_textRetrieve"))
+            self.assertEqual(text, "".join(dss.iter_text(path, chunk_size=4096)))
+        with HecDss(filename) as dss:
+            # the size of the record is not known here, and it is larger than the default limit
+            with self.assertRaises(ValueError):
+                dss.get(path)
+            self.assertEqual(text, dss.get_text(path, max_size=8 * 1048576).text)
+
+    def test_text_under_limit(self):
+        filename = self.test_files.get_copy("TestAlt1-dss-v7.dss")
+        path = "/A/B/C/D/E/medium/"
+        text = "".join(f"line {i} of a medium text record\n" for i in range(10000))
+        with HecDss(filename) as dss:
+            dss.put(Text.create(path, text))
+        with HecDss(filename) as dss:
+            # the buffer grows until the text fits, then that size is reused
+            self.assertEqual(text, dss.get(path).text)
+            dss.reset_native_call_counts()
+            self.assertEqual(text, dss.get(path).text)
+            self.assertEqual(1, dss.get_native_call_counts().get("hec_dss_textRetrieve"))
+        with HecDss(filename) as dss:
+            with self.assertRaises(ValueError):
+                dss.get_text(path, max_size=1024)
 
 if __name__ == "__main__":
     unittest.main()